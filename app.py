@@ -1,34 +1,319 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
+from flask import (Flask, Blueprint, current_app, g, has_request_context, render_template, request, redirect,
+                   url_for, flash, jsonify, abort, send_file, send_from_directory, stream_with_context,
+                   before_render_template, template_rendered)
 from flask_sqlalchemy import SQLAlchemy
-import qrcode
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+import click
 import io
-from datetime import datetime
+import hashlib
+import gzip
+import base64
+import json
+import csv
+import bisect
+import heapq
+import itertools
+import multiprocessing
+import queue
+import re
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from urllib.parse import urlencode, urlsplit
 import os
+import socket
+import tempfile
+import threading
+import time
 
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
-app = Flask(__name__)
+# ReportLab and qrcode (with PIL) are only imported when a PDF or QR code is
+# first rendered, or up front by load_renderers() when PRELOAD_RENDERERS is set.
 
-# environment variables for production
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'nigerian-restaurant-secret-key-2026')
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
 
-# SIMPLE DATABASE URL FIX
-database_url = os.environ.get('DATABASE_URL')
-if database_url and database_url.startswith('postgres://'):
-    database_url = database_url.replace('postgres://', 'postgresql://', 1)
-elif not database_url:
-    database_url = 'sqlite:///nigerian_restaurant.db'
+try:
+    import fcntl
+except ImportError:  # not available on Windows; init-db then runs without a lock there
+    fcntl = None
 
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///nigerian_restaurant.db').replace('postgres://', 'postgresql://')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+db = SQLAlchemy()
+main = Blueprint('main', __name__, cli_group=None)
 
-db = SQLAlchemy(app)
+def create_app(config=None):
+    """Create and configure the application.
+
+    gunicorn serves the module-level app built from this. With --preload (see
+    gunicorn.conf.py) it is created once in the master process and PDF/QR
+    libraries are loaded there, so forked workers share them copy-on-write.
+    """
+    app = Flask(__name__)
+
+    # environment variables for production
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'nigerian-restaurant-secret-key-2026')
+
+    # SIMPLE DATABASE URL FIX
+    database_url = os.environ.get('DATABASE_URL')
+    if database_url and database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+    elif not database_url:
+        database_url = 'sqlite:///nigerian_restaurant.db'
+
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Connection pool per worker: connections kept and allowed on top, seconds to wait for one,
+    # seconds before a connection is replaced (managed databases drop idle ones), whether to
+    # test connections before use, and the Postgres statement timeout in milliseconds (0 = none)
+    app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', '5'))
+    app.config['DB_MAX_OVERFLOW'] = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+    app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('DB_POOL_TIMEOUT', '10'))
+    app.config['DB_POOL_RECYCLE'] = int(os.environ.get('DB_POOL_RECYCLE', '300'))
+    app.config['DB_POOL_PRE_PING'] = os.environ.get('DB_POOL_PRE_PING', '1').lower() in ('1', 'true', 'yes')
+    app.config['DB_STATEMENT_TIMEOUT'] = int(os.environ.get('DB_STATEMENT_TIMEOUT', '0'))
+    # Static export: directory re-exported after every menu change (unset = only on demand), and
+    # the public URL of the site, which the exported QR codes point at
+    app.config['STATIC_EXPORT_DIR'] = os.environ.get('STATIC_EXPORT_DIR', '')
+    app.config['STATIC_EXPORT_BASE_URL'] = os.environ.get('STATIC_EXPORT_BASE_URL', '')
+    # Seconds /health/ready reuses its database check, so frequent probes don't each query
+    app.config['HEALTH_CHECK_TTL'] = float(os.environ.get('HEALTH_CHECK_TTL', '5'))
+
+    # How long (seconds) a worker trusts its cached menu version before re-reading it from the database
+    app.config['MENU_VERSION_TTL'] = float(os.environ.get('MENU_VERSION_TTL', '1'))
+    # Encoded QR images kept in memory, and how long browsers/CDNs may cache them
+    app.config['QR_CACHE_SIZE'] = int(os.environ.get('QR_CACHE_SIZE', '256'))
+    app.config['QR_CACHE_MAX_AGE'] = int(os.environ.get('QR_CACHE_MAX_AGE', str(30 * 24 * 3600)))
+    # Rows per bulk statement during menu imports
+    app.config['MENU_IMPORT_BATCH_SIZE'] = int(os.environ.get('MENU_IMPORT_BATCH_SIZE', '500'))
+    # Change-feed streams: how often each one checks for changes, when it closes, and how many
+    # may be open per worker (each one holds a worker thread for its whole life)
+    app.config['MENU_STREAM_POLL_INTERVAL'] = float(os.environ.get('MENU_STREAM_POLL_INTERVAL', '2'))
+    app.config['MENU_STREAM_TIMEOUT'] = float(os.environ.get('MENU_STREAM_TIMEOUT', '300'))
+    app.config['MENU_STREAM_MAX_OPEN'] = int(os.environ.get('MENU_STREAM_MAX_OPEN', '2'))
+    # Log requests slower than this many seconds with their SQL breakdown (0 disables)
+    app.config['SLOW_REQUEST_THRESHOLD'] = float(os.environ.get('SLOW_REQUEST_THRESHOLD', '0'))
+    # Import ReportLab and qrcode at startup instead of on first use
+    app.config['PRELOAD_RENDERERS'] = os.environ.get('PRELOAD_RENDERERS', '').lower() in ('1', 'true', 'yes')
+    # 'memory' (default) or 'postgres' to match search text with Postgres full-text search
+    app.config['SEARCH_BACKEND'] = os.environ.get('SEARCH_BACKEND', 'memory')
+    # Background jobs: pool processes per worker, where finished files go, when a pending job counts
+    # as lost, and how long a request waits for a file that has never been built. Pool processes
+    # start on demand, so idle ones only exist after a burst of work such as a QR sheet
+    app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', min(4, os.cpu_count() or 1)))
+    app.config['JOB_ARTIFACT_DIR'] = os.environ.get('JOB_ARTIFACT_DIR', os.path.join(app.instance_path, 'artifacts'))
+    app.config['JOB_TIMEOUT'] = float(os.environ.get('JOB_TIMEOUT', '300'))
+    app.config['JOB_WAIT_TIMEOUT'] = float(os.environ.get('JOB_WAIT_TIMEOUT', '30'))
+    # Uploaded item photos and their resized copies, and the largest upload accepted (bytes)
+    app.config['IMAGE_DIR'] = os.environ.get('IMAGE_DIR', os.path.join(app.instance_path, 'images'))
+    app.config['IMAGE_MAX_BYTES'] = int(os.environ.get('IMAGE_MAX_BYTES', str(10 * 1024 * 1024)))
+    # Where the last menu snapshot and PDFs built from the database are kept for outages, and the
+    # circuit breaker: failures in a row before the database is skipped, and for how many seconds
+    app.config['LAST_KNOWN_GOOD_DIR'] = os.environ.get('LAST_KNOWN_GOOD_DIR',
+                                                       os.path.join(app.instance_path, 'last-known-good'))
+    app.config['DB_BREAKER_THRESHOLD'] = int(os.environ.get('DB_BREAKER_THRESHOLD', '3'))
+    app.config['DB_BREAKER_COOLDOWN'] = float(os.environ.get('DB_BREAKER_COOLDOWN', '30'))
+
+    if config:
+        app.config.update(config)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+
+    db.init_app(app)
+    app.register_blueprint(main)
+    before_render_template.connect(_start_template_timer, app)
+    template_rendered.connect(_stop_template_timer, app)
+
+    if app.config['PRELOAD_RENDERERS']:
+        load_renderers()
+
+    return app
+
+def engine_options(config):
+    """SQLAlchemy engine options from the DB_* settings; SQLite only gets the ones that apply to it"""
+    url = config['SQLALCHEMY_DATABASE_URI']
+    options = {'pool_pre_ping': config['DB_POOL_PRE_PING'], 'pool_recycle': config['DB_POOL_RECYCLE']}
+    if url.startswith('sqlite'):
+        return options
+    options.update(pool_size=config['DB_POOL_SIZE'], max_overflow=config['DB_MAX_OVERFLOW'],
+                   pool_timeout=config['DB_POOL_TIMEOUT'])
+    if config['DB_STATEMENT_TIMEOUT'] and url.startswith('postgresql'):
+        options['connect_args'] = {'options': f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT']}"}
+    return options
+
+# Instrumentation
+# Request latency, SQL query counts and durations, render/build timers and
+# swallowed-exception counters, kept in process memory and exported in the
+# Prometheus text format at /metrics. Each gunicorn worker keeps its own
+# numbers, and the series carry a pid label so scrapes from different workers
+# can be told apart.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+SEARCH_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+METRICS = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by endpoint', LATENCY_BUCKETS),
+    'http_request_db_queries': ('histogram', 'SQL queries per request by endpoint', QUERY_COUNT_BUCKETS),
+    'http_request_db_seconds': ('histogram', 'Time spent in SQL per request by endpoint', LATENCY_BUCKETS),
+    'template_render_seconds': ('histogram', 'Jinja template render time', LATENCY_BUCKETS),
+    'pdf_build_seconds': ('histogram', 'ReportLab menu PDF build time', LATENCY_BUCKETS),
+    'qr_encode_seconds': ('histogram', 'QR code encode time', LATENCY_BUCKETS),
+    'image_process_seconds': ('histogram', 'Item photo upload processing time', LATENCY_BUCKETS),
+    'search_seconds': ('histogram', 'Menu search time, including any index update', SEARCH_BUCKETS),
+    'job_seconds': ('histogram', 'Background job build time by kind', LATENCY_BUCKETS),
+    'static_export_seconds': ('histogram', 'Static site export time', LATENCY_BUCKETS),
+    'jobs_total': ('counter', 'Finished background jobs by kind and status', None),
+    'qr_sheet_codes_total': ('counter', 'Table QR codes for sheets, reused from the cache or encoded', None),
+    'menu_pdf_requests_total': ('counter', 'Menu PDF requests by cache result', None),
+    'swallowed_exceptions_total': ('counter', 'Exceptions caught and hidden from the user, by location', None),
+    'stale_responses_total': ('counter', 'Responses served from the last known good menu, by endpoint', None),
+    'db_breaker_opened_total': ('counter', 'Times the database circuit breaker opened', None),
+}
+_metrics = {name: {} for name in METRICS}
+_metrics_lock = threading.Lock()
+
+def observe(name, value, **labels):
+    """Record a value in a histogram"""
+    buckets = METRICS[name][2]
+    key = tuple(sorted(labels.items()))
+    with _metrics_lock:
+        series = _metrics[name].get(key)
+        if series is None:
+            series = _metrics[name][key] = {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                series['buckets'][i] += 1
+        series['sum'] += value
+        series['count'] += 1
+
+def increment(name, amount=1, **labels):
+    """Add to a counter"""
+    key = tuple(sorted(labels.items()))
+    with _metrics_lock:
+        _metrics[name][key] = _metrics[name].get(key, 0) + amount
+
+def record_swallowed_exception(location):
+    """Count and log an exception that is being hidden behind a fallback"""
+    increment('swallowed_exceptions_total', location=location)
+    current_app.logger.exception('Swallowed exception in %s', location)
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + '}'
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format"""
+    pid = ('pid', os.getpid())
+    lines = []
+    with _metrics_lock:
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, series in sorted(_metrics[name].items()):
+                labels = key + (pid,)
+                if kind == 'counter':
+                    lines.append(f'{name}{_format_labels(labels)} {series}')
+                    continue
+                for bound, count in zip(buckets, series['buckets']):
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", bound),))} {count}')
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {series["count"]}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {series["sum"]}')
+                lines.append(f'{name}_count{_format_labels(labels)} {series["count"]}')
+    return '\n'.join(lines) + '\n'
+
+# The start time lives on the execution context, which is dropped with the
+# statement, so a query that raises leaves nothing behind on the connection
+@db.event.listens_for(Engine, 'before_cursor_execute')
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+@db.event.listens_for(Engine, 'after_cursor_execute')
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    if has_request_context() and 'db_queries' in g:
+        g.db_queries.append((statement, elapsed))
+
+def _start_template_timer(sender, template, context, **extra):
+    if has_request_context():
+        g.setdefault('template_timers', []).append(time.perf_counter())
+
+def _stop_template_timer(sender, template, context, **extra):
+    if has_request_context() and g.get('template_timers'):
+        observe('template_render_seconds', time.perf_counter() - g.template_timers.pop(), template=template.name)
+
+@main.before_app_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    g.db_queries = []
+
+@main.after_app_request
+def _record_request_metrics(response):
+    if 'request_started' not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_started
+    endpoint = request.endpoint or 'unmatched'
+    db_seconds = sum(duration for _, duration in g.db_queries)
+    observe('http_request_duration_seconds', elapsed, endpoint=endpoint, method=request.method,
+            status=response.status_code)
+    observe('http_request_db_queries', len(g.db_queries), endpoint=endpoint)
+    observe('http_request_db_seconds', db_seconds, endpoint=endpoint)
+
+    threshold = current_app.config['SLOW_REQUEST_THRESHOLD']
+    if threshold and elapsed >= threshold:
+        # Group identical statements so N+1 patterns stand out
+        breakdown = {}
+        for statement, duration in g.db_queries:
+            count, total = breakdown.get(statement, (0, 0.0))
+            breakdown[statement] = (count + 1, total + duration)
+        worst = sorted(breakdown.items(), key=lambda entry: entry[1][1], reverse=True)[:5]
+        current_app.logger.warning(
+            'Slow request %s %s: %.3fs, %d queries in %.3fs%s',
+            request.method, request.full_path.rstrip('?'), elapsed, len(g.db_queries), db_seconds,
+            ''.join(f"\n  {count}x {total:.3f}s {' '.join(statement.split())[:200]}"
+                    for statement, (count, total) in worst)
+        )
+    return response
+
+@main.route('/metrics')
+def metrics():
+    """Prometheus metrics for this worker process"""
+    return current_app.response_class(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+# Files
+# Generated files (job artifacts, photos, QR codes, the last known good menu and
+# static exports) are written to a temporary file and renamed into place, so
+# readers never see a partial file. tempfile creates files readable by their
+# owner only; they get the permissions the umask would give a plain open(), so
+# e.g. a web server running as another user can serve an export.
+_umask = os.umask(0)
+os.umask(_umask)
+
+def write_file_atomically(path, body):
+    """Write body (bytes, or a function given the open file) to path; a failed write leaves nothing behind"""
+    f = tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False)
+    try:
+        with f:
+            if callable(body):
+                body(f)
+            else:
+                f.write(body)
+        os.chmod(f.name, 0o666 & ~_umask)
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.remove(f.name)
+        except FileNotFoundError:
+            pass
+        raise
 
 # Database Models
 class Category(db.Model):
@@ -54,15 +339,565 @@ class MenuItem(db.Model):
     image_url = db.Column(db.String(200), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Public menu: available items per category
+        db.Index('ix_menu_item_category_available', 'category_id', 'available'),
+        # Imports and the admin table: items by name within a category
+        db.Index('ix_menu_item_category_name', 'category_id', 'name'),
+        db.Index('ix_menu_item_available', 'available'),
+    )
+
     def __repr__(self):
         return f'<MenuItem {self.name}>'
 
+class MenuVersion(db.Model):
+    """Single-row counter bumped by every admin write; shared by all workers"""
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<MenuVersion {self.version}>'
+
+class MenuChange(db.Model):
+    """Change log of admin edits; the id doubles as the feed sequence number"""
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)  # 'category' or 'item'
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(20), nullable=False)  # create, update, delete or availability
+    data = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'seq': self.id,
+            'entity': self.entity,
+            'entity_id': self.entity_id,
+            'action': self.action,
+            'data': self.data,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
+
+    def __repr__(self):
+        return f'<MenuChange {self.id} {self.action} {self.entity} {self.entity_id}>'
+
+class Job(db.Model):
+    """A print-asset generation job (menu PDF, poster) run in the background process pool"""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)
+    # The kind and its parameters, e.g. 'menu_pdf?language=fr'; identifies the artifact
+    target = db.Column(db.String(200), nullable=False)
+    params = db.Column(db.JSON, nullable=False, default=dict)
+    menu_version = db.Column(db.Integer, nullable=True)  # for artifacts built from the menu
+    # Set while the job is pending, so an identical request reuses it
+    dedupe_key = db.Column(db.String(64), nullable=True, unique=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, done or failed
+    worker = db.Column(db.String(100), nullable=True)  # host:pid of the process running it
+    error = db.Column(db.Text, nullable=True)
+    artifact = db.Column(db.String(200), nullable=True)  # file name in JOB_ARTIFACT_DIR
+    artifact_size = db.Column(db.Integer, nullable=True)
+    duration = db.Column(db.Float, nullable=True)  # seconds spent building
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Latest finished artifact per target
+        db.Index('ix_job_target_status', 'target', 'status'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'params': self.params,
+            'menu_version': self.menu_version,
+            'status': self.status,
+            'error': self.error,
+            'artifact_size': self.artifact_size,
+            'duration': self.duration,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'result_url': url_for('main.job_result', id=self.id) if self.artifact else None,
+        }
+
+    def __repr__(self):
+        return f'<Job {self.id} {self.target} {self.status}>'
+
+# Menu snapshot cache
+# Public pages only change when an admin edits the menu, so each worker keeps a
+# plain-data snapshot of the menu (and the HTML rendered from it) keyed by the
+# version stored in the database. Admin writes bump that version in the same
+# transaction, which invalidates the snapshot in every worker.
+_menu_version_state = {'version': None, 'updated_at': None, 'checked_at': 0.0}
+_menu_cache = {'snapshot': None}
+_menu_snapshot_lock = threading.Lock()
+
+def bump_menu_version():
+    """Increment the menu version as part of the current transaction"""
+    updated = db.session.execute(
+        db.update(MenuVersion)
+        .where(MenuVersion.id == 1)
+        .values(version=MenuVersion.version + 1, updated_at=datetime.utcnow())
+    )
+    if updated.rowcount == 0:
+        db.session.add(MenuVersion(id=1, version=1))
+    db.session.info['menu_version_bumped'] = True
+    # Force this worker to re-read the version on its next request
+    _menu_version_state['checked_at'] = 0.0
+
+def menu_change_values(action, obj):
+    """Column values for the change-log entry of a category or item as it stands now"""
+    if isinstance(obj, Category):
+        entity, data = 'category', category_to_dict(obj)
+    else:
+        entity, data = 'item', menu_item_to_dict(obj)
+    return {
+        'entity': entity,
+        'entity_id': obj.id,
+        'action': action,
+        'data': None if action == 'delete' else project(data, data.keys()),
+    }
+
+def latest_change_seq():
+    """Sequence number of the newest change-feed entry, 0 if there is none"""
+    return db.session.query(db.func.max(MenuChange.id)).scalar() or 0
+
+def record_menu_change(action, obj):
+    """Add a change-log entry for a category or item as part of the current transaction"""
+    if obj.id is None:
+        # New rows need their id (and column defaults) before they can be logged
+        db.session.flush()
+    db.session.add(MenuChange(**menu_change_values(action, obj)))
+
+def get_menu_version(max_age=None):
+    """Return the current menu version, re-reading it at most every MENU_VERSION_TTL (or max_age) seconds"""
+    now = time.monotonic()
+    if max_age is None:
+        max_age = current_app.config['MENU_VERSION_TTL']
+    if (_menu_version_state['version'] is not None
+            and now - _menu_version_state['checked_at'] < max_age):
+        return _menu_version_state['version']
+    row = db.session.query(MenuVersion.version, MenuVersion.updated_at).filter_by(id=1).first()
+    version, updated_at = row if row else (0, None)
+    _menu_version_state['version'] = version
+    _menu_version_state['updated_at'] = updated_at
+    _menu_version_state['checked_at'] = now
+    return version
+
+def category_to_dict(category):
+    return {
+        'id': category.id,
+        'name': category.name,
+        'description': category.description,
+        'icon': category.icon,
+    }
+
+def menu_item_to_dict(item):
+    return {
+        'id': item.id,
+        'name': item.name,
+        'description': item.description,
+        'price': item.price,
+        'category_id': item.category_id,
+        'available': item.available,
+        'is_spicy': item.is_spicy,
+        'is_vegetarian': item.is_vegetarian,
+        'prep_time': item.prep_time,
+        'image_url': item.image_url,
+        'created_at': item.created_at,
+    }
+
+def load_menu_view():
+    """Load categories and their available items with one joined query.
+
+    Returns the flat 'categories' and available 'menu_items' lists plus
+    'menu_sections', the same data already grouped as an ordered list of
+    {'category': ..., 'menu_items': [...]} so templates, the PDF builder and
+    the API never have to filter items per category themselves. 'all_items'
+    also includes unavailable items, for the API.
+    """
+    rows = (
+        db.session.query(Category, MenuItem)
+        .outerjoin(MenuItem, MenuItem.category_id == Category.id)
+        .order_by(Category.id, MenuItem.id)
+        .all()
+    )
+
+    categories = []
+    all_items = []
+    menu_items = []
+    menu_sections = []
+    for category, item in rows:
+        if not categories or categories[-1]['id'] != category.id:
+            categories.append(category_to_dict(category))
+            menu_sections.append({'category': categories[-1], 'menu_items': []})
+        if item is not None:
+            item = menu_item_to_dict(item)
+            all_items.append(item)
+            if item['available']:
+                menu_items.append(item)
+                menu_sections[-1]['menu_items'].append(item)
+
+    # The API pages through items by id
+    all_items.sort(key=lambda item: item['id'])
+
+    return {
+        'categories': categories,
+        'menu_items': menu_items,
+        'menu_sections': menu_sections,
+        'all_items': all_items,
+    }
+
+def get_menu_snapshot():
+    """Return the cached menu snapshot, rebuilding it if the menu version has moved on.
+
+    A snapshot is never modified once published (apart from filling in its page
+    cache), so callers can keep using the one they got while a newer one is built.
+    While the database is unreachable, the last known good snapshot is returned
+    instead (see below).
+    """
+    if not db_breaker_allows():
+        snapshot = stale_menu_snapshot()
+        if snapshot is None:
+            raise DatabaseUnavailable('The database is unreachable and no menu has been saved')
+        return snapshot
+    try:
+        snapshot = _load_menu_snapshot()
+    except DB_UNAVAILABLE_ERRORS:
+        db.session.rollback()
+        record_db_failure()
+        snapshot = stale_menu_snapshot()
+        if snapshot is None:
+            raise
+        return snapshot
+    record_db_success()
+    return snapshot
+
+def _load_menu_snapshot():
+    version = get_menu_version()
+    snapshot = _menu_cache['snapshot']
+    if snapshot is not None and snapshot['version'] == version:
+        return snapshot
+    with _menu_snapshot_lock:
+        # Another thread may have rebuilt it while we waited for the lock
+        snapshot = _menu_cache['snapshot']
+        if snapshot is not None and snapshot['version'] == version:
+            return snapshot
+        # Lets open pages follow the change feed from where their HTML left off. Read before the
+        # rows: a change committed in between is then replayed again (harmlessly) rather than skipped
+        change_seq = latest_change_seq()
+        data = load_menu_view()
+        data['change_seq'] = change_seq
+        snapshot = {
+            'version': version,
+            'updated_at': _menu_version_state['updated_at'],
+            'data': data,
+            'pages': {},
+        }
+        _menu_cache['snapshot'] = snapshot
+        try:
+            save_last_known_good(snapshot)
+        except Exception:
+            record_swallowed_exception('save_last_known_good')
+    return snapshot
+
+def clear_menu_caches():
+    """Forget every cached snapshot, page, PDF, search index and QR image, and the breaker state (e.g. after pointing the app at another database)"""
+    _menu_version_state.update({'version': None, 'updated_at': None, 'checked_at': 0.0})
+    _menu_cache['snapshot'] = None
+    _last_known_good.update({'key': None, 'snapshot': None, 'saved_version': 0})
+    _db_breaker.update({'failures': 0, 'opened_at': None})
+    _health_check['result'] = None
+    _artifact_cache.clear()
+    _search_index['index'] = None
+    with _qr_cache_lock:
+        _qr_cache.clear()
+
+# Last known good menu
+# Each snapshot built from the database is also written to LAST_KNOWN_GOOD_DIR,
+# as is each finished menu PDF. When the database is unreachable, readers get the
+# newest of these instead of an error, marked with an X-Menu-Stale header. After
+# DB_BREAKER_THRESHOLD failures in a row the circuit breaker opens: for
+# DB_BREAKER_COOLDOWN seconds the database is not tried at all, so requests stop
+# waiting on connection timeouts, and then one request probes it again. The
+# snapshot file is only read when an outage starts, and again only after it has
+# changed; each worker keeps its own parsed copy.
+DB_UNAVAILABLE_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError)
+LAST_KNOWN_GOOD_SNAPSHOT = 'menu-snapshot.json'
+LAST_KNOWN_GOOD_PDF_PATTERN = re.compile(r'menu-([a-z]+)-v(\d+)\.pdf')
+LAST_KNOWN_GOOD_KEEP_PDFS = 2  # per language
+_db_breaker = {'failures': 0, 'opened_at': None}
+_db_breaker_lock = threading.Lock()
+_last_known_good = {'key': None, 'snapshot': None, 'saved_version': 0}
+
+class DatabaseUnavailable(Exception):
+    """The circuit breaker is open and there is nothing saved to fall back on"""
+
+def db_breaker_allows():
+    """False while the breaker is open; once the cooldown is over, lets one caller probe the database"""
+    with _db_breaker_lock:
+        opened_at = _db_breaker['opened_at']
+        if opened_at is None:
+            return True
+        if time.monotonic() - opened_at < current_app.config['DB_BREAKER_COOLDOWN']:
+            return False
+        # Everyone else keeps skipping the database for another cooldown while this caller tries it
+        _db_breaker['opened_at'] = time.monotonic()
+        return True
+
+def db_breaker_is_open():
+    return _db_breaker['opened_at'] is not None
+
+def record_db_success():
+    if _db_breaker['failures'] == 0 and _db_breaker['opened_at'] is None:
+        return
+    with _db_breaker_lock:
+        if _db_breaker['opened_at'] is not None:
+            current_app.logger.warning('Database reachable again; closing the circuit breaker')
+        _db_breaker.update({'failures': 0, 'opened_at': None})
+
+def record_db_failure():
+    with _db_breaker_lock:
+        _db_breaker['failures'] += 1
+        if _db_breaker['failures'] < current_app.config['DB_BREAKER_THRESHOLD']:
+            return
+        if _db_breaker['opened_at'] is None:
+            increment('db_breaker_opened_total')
+            current_app.logger.warning('Database unreachable after %d attempts; serving the last known good menu',
+                                       _db_breaker['failures'])
+        _db_breaker['opened_at'] = time.monotonic()
+
+def _last_known_good_path(name):
+    return os.path.join(current_app.config['LAST_KNOWN_GOOD_DIR'], name)
+
+def _write_last_known_good(name, body):
+    directory = current_app.config['LAST_KNOWN_GOOD_DIR']
+    os.makedirs(directory, exist_ok=True)
+    write_file_atomically(os.path.join(directory, name), body)
+
+def _saved_snapshot_version(path):
+    """Version of the snapshot file, read from its first bytes without parsing the rest"""
+    try:
+        with open(path, 'rb') as f:
+            match = re.match(rb'\{"version": (\d+)', f.read(32))
+    except FileNotFoundError:
+        return 0
+    return int(match.group(1)) if match else 0
+
+def save_last_known_good(snapshot):
+    """Write a snapshot built from the database to disk, unless the file already holds this version or a newer one"""
+    if snapshot['version'] <= _last_known_good['saved_version']:
+        return
+    path = _last_known_good_path(LAST_KNOWN_GOOD_SNAPSHOT)
+    if _saved_snapshot_version(path) < snapshot['version']:
+        data = snapshot['data']
+        document = {
+            'version': snapshot['version'],
+            'updated_at': snapshot['updated_at'],
+            'change_seq': data['change_seq'],
+            'categories': data['categories'],
+            'all_items': data['all_items'],
+        }
+        _write_last_known_good(LAST_KNOWN_GOOD_SNAPSHOT,
+                               json.dumps(document, default=lambda value: value.isoformat()).encode())
+    _last_known_good['saved_version'] = snapshot['version']
+
+def load_last_known_good():
+    """The snapshot saved on disk, or None; the file is only parsed again after it changes"""
+    path = _last_known_good_path(LAST_KNOWN_GOOD_SNAPSHOT)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (stat.st_ino, stat.st_mtime_ns)
+    if _last_known_good['key'] == key:
+        return _last_known_good['snapshot']
+
+    with open(path, 'rb') as f:
+        saved = json.loads(f.read())
+    # Rebuild the grouped lists the same way load_menu_view() does
+    categories = saved['categories']
+    sections = [{'category': category, 'menu_items': []} for category in categories]
+    by_category = {section['category']['id']: section for section in sections}
+    for item in saved['all_items']:
+        if item['created_at']:
+            item['created_at'] = datetime.fromisoformat(item['created_at'])
+        if item['available'] and item['category_id'] in by_category:
+            by_category[item['category_id']]['menu_items'].append(item)
+    snapshot = {
+        'version': saved['version'],
+        'updated_at': datetime.fromisoformat(saved['updated_at']) if saved['updated_at'] else None,
+        'data': {
+            'categories': categories,
+            'menu_items': [item for section in sections for item in section['menu_items']],
+            'menu_sections': sections,
+            'all_items': saved['all_items'],
+            'change_seq': saved['change_seq'],
+        },
+        'pages': {},
+    }
+    _last_known_good.update({'key': key, 'snapshot': snapshot})
+    return snapshot
+
+def stale_menu_snapshot():
+    """The newest snapshot available without the database (this worker's or the saved one), or None"""
+    candidates = [snapshot for snapshot in (_menu_cache['snapshot'], load_last_known_good()) if snapshot is not None]
+    if not candidates:
+        return None
+    if has_request_context():
+        g.menu_stale = True
+    return max(candidates, key=lambda snapshot: snapshot['version'])
+
+def save_last_known_good_pdf(language, version, body):
+    """Keep a finished menu PDF on disk, with the one before it, for serving during outages"""
+    _write_last_known_good(f'menu-{language}-v{version}.pdf', body)
+    for _, name in _last_known_good_pdfs(language)[LAST_KNOWN_GOOD_KEEP_PDFS:]:
+        try:
+            os.remove(_last_known_good_path(name))
+        except FileNotFoundError:
+            pass
+
+def _last_known_good_pdfs(language):
+    """(version, file name) of the saved PDFs in a language, newest first"""
+    try:
+        names = os.listdir(current_app.config['LAST_KNOWN_GOOD_DIR'])
+    except FileNotFoundError:
+        return []
+    pdfs = []
+    for name in names:
+        match = LAST_KNOWN_GOOD_PDF_PATTERN.fullmatch(name)
+        if match and match.group(1) == language:
+            pdfs.append((int(match.group(2)), name))
+    return sorted(pdfs, reverse=True)
+
+def database_unavailable_response(message):
+    """503 asking the client to retry once the breaker's cooldown is over"""
+    response = jsonify({'error': message})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(int(current_app.config['DB_BREAKER_COOLDOWN']))
+    return response
+
+def last_known_good_pdf_response(language, filename):
+    """Serve the newest saved menu PDF, or 503 if there is none"""
+    g.menu_stale = True
+    pdfs = _last_known_good_pdfs(language)
+    if not pdfs:
+        return database_unavailable_response('The menu PDF is unavailable while the database is unreachable')
+    response = send_file(_last_known_good_path(pdfs[0][1]), mimetype='application/pdf',
+                         as_attachment=True, download_name=filename)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@main.after_app_request
+def _mark_stale_response(response):
+    if g.get('menu_stale'):
+        response.headers['X-Menu-Stale'] = 'true'
+        increment('stale_responses_total', endpoint=request.endpoint or 'unmatched')
+    return response
+
+def render_menu_page(template):
+    """Render a public menu template from the snapshot, reusing the cached (and compressed) HTML when possible"""
+    snapshot = get_menu_snapshot()
+    page = snapshot['pages'].get(template)
+    if page is None:
+        html = render_template(template, **snapshot['data'])
+        page = snapshot['pages'][template] = encode_variants(html.encode('utf-8'))
+    return cached_response(
+        page,
+        'text/html',
+        f"v{snapshot['version']}-{page['digest']}",
+        last_modified=snapshot['updated_at']
+    )
+
+# Conditional and pre-compressed responses
+# Cached bodies are compressed once when they are produced. Each response picks
+# the best variant the client accepts and carries validators so that a phone
+# rescanning the QR code gets a 304 instead of the whole page again.
+def encode_variants(body, compress=True):
+    """Return the identity, gzip and (if available) brotli encodings of a body.
+
+    Pass compress=False for formats that are already compressed, such as PNG.
+    """
+    variants = {
+        'digest': hashlib.sha256(body).hexdigest()[:16],
+        'identity': body,
+    }
+    if compress:
+        variants['gzip'] = gzip.compress(body, compresslevel=9)
+        if brotli is not None:
+            variants['br'] = brotli.compress(body, quality=9)
+    return variants
+
+def pick_encoding(variants):
+    """Choose the smallest encoding the client accepts"""
+    best = 'identity'
+    for encoding in ('br', 'gzip'):
+        if (encoding in variants and request.accept_encodings[encoding] > 0
+                and len(variants[encoding]) < len(variants[best])):
+            best = encoding
+    return best
+
+def cached_response(variants, mimetype, etag, last_modified=None, max_age=None):
+    """Build a response from pre-encoded variants, answering conditional requests with 304"""
+    encoding = pick_encoding(variants)
+    response = current_app.response_class(variants[encoding], mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+        etag = f'{etag}-{encoding}'
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    if max_age is None:
+        # Let clients keep a copy but make them revalidate it on every use
+        response.cache_control.no_cache = True
+    else:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+
+# Arbitrary constant identifying the init-db lock among Postgres advisory locks
+INIT_DB_LOCK_KEY = 7263510
+
+@contextmanager
+def init_db_lock():
+    """Make sure only one process creates tables and seeds data at a time.
+
+    Postgres gets a session-level advisory lock; for SQLite (one machine) an
+    exclusive lock on a file in the temp directory is enough.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        with db.engine.connect() as connection:
+            connection.execute(db.text('SELECT pg_advisory_lock(:key)'), {'key': INIT_DB_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(db.text('SELECT pg_advisory_unlock(:key)'), {'key': INIT_DB_LOCK_KEY})
+                connection.commit()
+    elif fcntl is not None:
+        with open(os.path.join(tempfile.gettempdir(), 'naija-flavours-init-db.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+    else:
+        yield
+
 # Initialize database - WITH ERROR HANDLING
 def init_db():
+    """Create tables and indexes and seed the sample menu; run once per deployment with `flask init-db`"""
     try:
-        with app.app_context():
-            print(f"🔗 Using database URL: {app.config['SQLALCHEMY_DATABASE_URI']}")
+        with init_db_lock():
+            print(f"🔗 Using database URL: {current_app.config['SQLALCHEMY_DATABASE_URI']}")
             db.create_all()
+            # create_all() skips tables that already exist, so add any new indexes to them
+            for index in MenuItem.__table__.indexes:
+                index.create(bind=db.engine, checkfirst=True)
+            if db.engine.dialect.name == 'postgresql':
+                # Full-text index for SEARCH_BACKEND=postgres
+                with db.engine.begin() as conn:
+                    conn.execute(db.text(
+                        f'CREATE INDEX IF NOT EXISTS ix_menu_item_search ON menu_item USING gin ({SEARCH_DOCUMENT_SQL})'
+                    ))
             print("✅ Database tables created!")
             
             # Add sample data if no categories exist
@@ -153,47 +988,96 @@ def init_db():
                             price=1200, category_id=6, is_spicy=False, is_vegetarian=True, prep_time='5 min')
                 ]
                 db.session.add_all(items)
+                bump_menu_version()
                 db.session.commit()
                 print("✅ Nigerian restaurant sample data added!")
     except Exception as e:
         print(f"⚠️ Database initialization error: {str(e)}")
         print("⚠️ Continuing without database...")
 
-# Call init_db AFTER all models and routes are defined
-init_db()
+@main.cli.command('init-db')
+def init_db_command():
+    """Create tables and indexes and seed sample data (run once per deployment, before starting workers)"""
+    init_db()
 
 # Routes (ALL ROUTES REMAIN THE SAME)
-@app.route('/')
+@main.route('/')
 def index():
     try:
-        categories = Category.query.all()
-        menu_items = MenuItem.query.filter_by(available=True).all()
-    except:
-        categories = []
-        menu_items = []
-    return render_template('index.html', categories=categories, menu_items=menu_items)
+        return render_menu_page('index.html')
+    except Exception:
+        record_swallowed_exception('index')
+        return render_template('index.html', categories=[], menu_items=[], menu_sections=[])
 
-@app.route('/menu')
+@main.route('/menu')
 def menu():
     try:
-        categories = Category.query.all()
-        menu_items = MenuItem.query.filter_by(available=True).all()
-    except:
-        categories = []
-        menu_items = []
-    return render_template('menu.html', categories=categories, menu_items=menu_items)
+        return render_menu_page('menu.html')
+    except Exception:
+        record_swallowed_exception('menu')
+        return render_template('menu.html', categories=[], menu_items=[], menu_sections=[], change_seq=0)
+
+ADMIN_SORT_COLUMNS = {
+    'name': MenuItem.name,
+    'category': Category.name,
+    'price': MenuItem.price,
+    'prep_time': MenuItem.prep_time,
+    'available': MenuItem.available,
+    'created': MenuItem.created_at,
+}
+ADMIN_PER_PAGE = 50
+ADMIN_MAX_PER_PAGE = 200
 
-@app.route('/admin')
+@main.route('/admin')
 def admin():
+    """Admin dashboard; the item table is paginated, sortable (?sort=&order=) and searchable (?q=&category=)"""
+    filters = {
+        'q': request.args.get('q', '').strip(),
+        'category': request.args.get('category', type=int),
+        'sort': request.args.get('sort') if request.args.get('sort') in ADMIN_SORT_COLUMNS else 'category',
+        'order': 'desc' if request.args.get('order') == 'desc' else 'asc',
+        'per_page': min(max(request.args.get('per_page', ADMIN_PER_PAGE, type=int), 1), ADMIN_MAX_PER_PAGE),
+    }
     try:
-        categories = Category.query.all()
-        menu_items = MenuItem.query.all()
-    except:
+        # Bulk actions send this back so edits to the listed items since can be detected;
+        # read first, so nothing committed after the items were loaded is missed
+        change_seq = latest_change_seq()
+        categories = Category.query.order_by(Category.id).all()
+        item_counts = dict(
+            db.session.query(MenuItem.category_id, db.func.count(MenuItem.id))
+            .group_by(MenuItem.category_id)
+            .all()
+        )
+
+        # Load each page of items together with its category in one query
+        query = (
+            db.select(MenuItem)
+            .join(MenuItem.category)
+            .options(db.contains_eager(MenuItem.category))
+        )
+        if filters['q']:
+            pattern = f"%{filters['q']}%"
+            query = query.where(db.or_(MenuItem.name.ilike(pattern), MenuItem.description.ilike(pattern)))
+        if filters['category']:
+            query = query.where(MenuItem.category_id == filters['category'])
+        column = ADMIN_SORT_COLUMNS[filters['sort']]
+        query = query.order_by(column.desc() if filters['order'] == 'desc' else column.asc(), MenuItem.id)
+
+        pagination = db.paginate(query, page=request.args.get('page', 1, type=int),
+                                 per_page=filters['per_page'], error_out=False)
+        menu_items = pagination.items
+    except Exception:
+        record_swallowed_exception('admin')
+        change_seq = None
         categories = []
         menu_items = []
-    return render_template('admin.html', categories=categories, menu_items=menu_items)
+        item_counts = {}
+        pagination = None
+    return render_template('admin.html', categories=categories, menu_items=menu_items, item_counts=item_counts,
+                           pagination=pagination, filters=filters, change_seq=change_seq,
+                           pdf_languages=PDF_LANGUAGES, paper_sizes=POSTER_PAPER_SIZES)
 
-@app.route('/category/add', methods=['POST'])
+@main.route('/category/add', methods=['POST'])
 def add_category():
     try:
         name = request.form.get('name')
@@ -203,24 +1087,30 @@ def add_category():
         if name:
             category = Category(name=name, description=description, icon=icon)
             db.session.add(category)
+            record_menu_change('create', category)
+            bump_menu_version()
             db.session.commit()
             flash('Category added successfully!', 'success')
     except Exception as e:
         flash(f'Error adding category: {str(e)}', 'error')
-    return redirect(url_for('admin'))
+    return redirect(url_for('main.admin'))
 
-@app.route('/category/delete/<int:id>')
+@main.route('/category/delete/<int:id>')
 def delete_category(id):
     try:
         category = Category.query.get_or_404(id)
+        for item in category.items:
+            record_menu_change('delete', item)
+        record_menu_change('delete', category)
         db.session.delete(category)
+        bump_menu_version()
         db.session.commit()
         flash('Category deleted successfully!', 'success')
     except Exception as e:
         flash(f'Error deleting category: {str(e)}', 'error')
-    return redirect(url_for('admin'))
+    return redirect(url_for('main.admin'))
 
-@app.route('/item/add', methods=['POST'])
+@main.route('/item/add', methods=['POST'])
 def add_item():
     try:
         name = request.form.get('name')
@@ -239,38 +1129,45 @@ def add_item():
                 category_id=int(category_id),
                 prep_time=prep_time,
                 is_spicy=is_spicy,
-                is_vegetarian=is_vegetarian
+                is_vegetarian=is_vegetarian,
+                image_url=save_uploaded_image()
             )
             db.session.add(item)
+            record_menu_change('create', item)
+            bump_menu_version()
             db.session.commit()
             flash('Menu item added successfully!', 'success')
     except Exception as e:
         flash(f'Error adding item: {str(e)}', 'error')
-    return redirect(url_for('admin'))
+    return redirect(url_for('main.admin'))
 
-@app.route('/item/toggle/<int:id>')
+@main.route('/item/toggle/<int:id>')
 def toggle_item(id):
     try:
         item = MenuItem.query.get_or_404(id)
         item.available = not item.available
+        record_menu_change('availability', item)
+        bump_menu_version()
         db.session.commit()
         flash(f'Item {"enabled" if item.available else "disabled"} successfully!', 'success')
     except Exception as e:
         flash(f'Error toggling item: {str(e)}', 'error')
-    return redirect(url_for('admin'))
+    return redirect(url_for('main.admin'))
 
-@app.route('/item/delete/<int:id>')
+@main.route('/item/delete/<int:id>')
 def delete_item(id):
     try:
         item = MenuItem.query.get_or_404(id)
+        record_menu_change('delete', item)
         db.session.delete(item)
+        bump_menu_version()
         db.session.commit()
         flash('Item deleted successfully!', 'success')
     except Exception as e:
         flash(f'Error deleting item: {str(e)}', 'error')
-    return redirect(url_for('admin'))
+    return redirect(url_for('main.admin'))
 
-@app.route('/item/edit/<int:id>', methods=['POST'])
+@main.route('/item/edit/<int:id>', methods=['POST'])
 def edit_item(id):
     try:
         item = MenuItem.query.get_or_404(id)
@@ -281,243 +1178,2502 @@ def edit_item(id):
         item.prep_time = request.form.get('prep_time')
         item.is_spicy = request.form.get('is_spicy') == 'on'
         item.is_vegetarian = request.form.get('is_vegetarian') == 'on'
+        image_url = save_uploaded_image()
+        if image_url:
+            item.image_url = image_url
+        elif request.form.get('remove_image') == 'on':
+            item.image_url = None
         
+        record_menu_change('update', item)
+        bump_menu_version()
         db.session.commit()
         flash('Item updated successfully!', 'success')
     except Exception as e:
         flash(f'Error updating item: {str(e)}', 'error')
-    return redirect(url_for('admin'))
+    return redirect(url_for('main.admin'))
+
+# Bulk item operations
+# Each operation is one UPDATE ... WHERE over all the selected items, run in a
+# single transaction with one menu version bump. The client sends back the
+# menu_version it loaded; if the menu has changed since, nothing is written and
+# the request fails with a conflict instead of overwriting the other change.
+class BulkConflict(Exception):
+    """Items in a bulk request changed since the client loaded them"""
+
+def wants_json_response():
+    return request.is_json or request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json'
+
+def bulk_request_values():
+    """Form fields or JSON body of a bulk request as a dict; 'ids' is always a list of ints"""
+    values = request.get_json(silent=True)
+    if not isinstance(values, dict):
+        values = request.form.to_dict()
+        values['ids'] = request.form.getlist('ids')
+    try:
+        values['ids'] = [int(item_id) for item_id in values.get('ids') or []]
+        values['change_seq'] = int(values['change_seq'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('ids must be item ids and change_seq is required')
+    return values
+
+def bulk_update_items(where, values, action, change_seq):
+    """Apply values to every item matching where and log the changes; returns the number of items updated.
+
+    change_seq is the change-feed position the client saw the items at. If any
+    of the matched items has changed since, nothing is written; edits to other
+    items don't matter. The feed is checked after the UPDATE, once the rows are
+    locked, so an edit committed while waiting for them is still caught.
+    """
+    try:
+        items = db.session.scalars(
+            db.update(MenuItem).where(where).values(**values).returning(MenuItem),
+            execution_options={'synchronize_session': False}
+        ).all()
+        if not items:
+            db.session.rollback()
+            return 0
+        conflict = db.session.scalar(
+            db.select(MenuChange.id)
+            .where(MenuChange.id > change_seq, MenuChange.entity == 'item',
+                   MenuChange.entity_id.in_([item.id for item in items]))
+            .limit(1)
+        )
+        if conflict is not None:
+            raise BulkConflict('Some of these items were changed by someone else. Reload and try again.')
+        db.session.execute(db.insert(MenuChange), [
+            {'entity': 'item', 'entity_id': item.id, 'action': action,
+             'data': project(menu_item_to_dict(item), API_ITEM_FIELDS)}
+            for item in items
+        ])
+        bump_menu_version()
+        db.session.commit()
+        return len(items)
+    except Exception:
+        db.session.rollback()
+        raise
+
+def bulk_response(operation, message):
+    """Run a bulk operation and report it the way the caller expects (JSON or flash + redirect)"""
+    try:
+        updated = operation(bulk_request_values())
+    except BulkConflict as e:
+        if wants_json_response():
+            return jsonify({'error': str(e), 'change_seq': latest_change_seq()}), 409
+        flash(str(e), 'error')
+    except Exception as e:
+        if wants_json_response():
+            return jsonify({'error': str(e)}), 400
+        flash(f'Error updating items: {str(e)}', 'error')
+    else:
+        if wants_json_response():
+            return jsonify({'updated': updated, 'change_seq': latest_change_seq()})
+        flash(message.format(count=updated), 'success')
+    return redirect(url_for('main.admin'))
+
+@main.route('/items/bulk/availability', methods=['POST'])
+def bulk_availability():
+    """Mark the items in ids as available (available=true) or sold out (available=false)"""
+    def operation(values):
+        if not values['ids']:
+            raise ValueError('Select at least one item')
+        available = str(values.get('available')).lower() in ('1', 'true', 'on', 'yes')
+        return bulk_update_items(MenuItem.id.in_(values['ids']), {'available': available},
+                                 'availability', values['change_seq'])
+
+    return bulk_response(operation, '{count} items updated successfully!')
+
+@main.route('/items/bulk/price', methods=['POST'])
+def bulk_price():
+    """Change prices of the items in ids, or of every item in category_id.
+
+    mode is 'percent' (amount is a percentage, e.g. 10 or -5) or 'absolute'
+    (amount in naira is added to each price). Prices never go below zero.
+    """
+    def operation(values):
+        try:
+            amount = float(values.get('amount'))
+        except (TypeError, ValueError):
+            raise ValueError('amount must be a number')
+        mode = values.get('mode', 'percent')
+        if mode == 'percent':
+            if amount <= -100:
+                raise ValueError('A percentage change must be greater than -100')
+            price = db.func.round(MenuItem.price * (1 + amount / 100), 2)
+        elif mode == 'absolute':
+            price = db.case((MenuItem.price + amount < 0, 0), else_=MenuItem.price + amount)
+        else:
+            raise ValueError("mode must be 'percent' or 'absolute'")
+
+        if values['ids']:
+            where = MenuItem.id.in_(values['ids'])
+        elif values.get('category_id'):
+            where = MenuItem.category_id == int(values['category_id'])
+        else:
+            raise ValueError('Select items or a category')
+        return bulk_update_items(where, {'price': price}, 'update', values['change_seq'])
+
+    return bulk_response(operation, 'Prices updated for {count} items!')
+
+@main.route('/items/bulk/move', methods=['POST'])
+def bulk_move():
+    """Move the items in ids to category_id"""
+    def operation(values):
+        if not values['ids']:
+            raise ValueError('Select at least one item')
+        category = db.session.get(Category, int(values.get('category_id') or 0))
+        if category is None:
+            raise ValueError('Choose a category to move the items to')
+        return bulk_update_items(MenuItem.id.in_(values['ids']), {'category_id': category.id},
+                                 'update', values['change_seq'])
+
+    return bulk_response(operation, '{count} items moved successfully!')
+
+# Bulk import/export
+# Catalogues are moved as one row per item, with the category given by name.
+# Imports are read incrementally, validated row by row and upserted in batches
+# of bulk INSERT/UPDATE statements inside a single transaction; an item is
+# matched by its name within its category. Exports stream straight from a
+# column query, so no ORM objects are built.
+MENU_FILE_FIELDS = ('category', 'category_description', 'category_icon', 'name', 'description',
+                    'price', 'available', 'is_spicy', 'is_vegetarian', 'prep_time', 'image_url')
+MENU_FILE_FORMATS = {'csv': 'text/csv', 'json': 'application/json', 'jsonl': 'application/x-ndjson'}
+MENU_FILE_MIMETYPES = {mimetype: fmt for fmt, mimetype in MENU_FILE_FORMATS.items()}
+
+def menu_file_format(filename=None, fmt=None):
+    """Work out the import/export format from an explicit value or a file extension"""
+    if not fmt and filename and '.' in filename:
+        fmt = filename.rsplit('.', 1)[1]
+    fmt = (fmt or 'csv').lower()
+    if fmt == 'ndjson':
+        fmt = 'jsonl'
+    if fmt not in MENU_FILE_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', use csv, json or jsonl")
+    return fmt
+
+def _iter_text_lines(stream):
+    """Decode a binary stream line by line, splitting only at line feeds (as csv and JSON Lines expect).
+
+    Iterating works on every stream an import gets, including the
+    SpooledTemporaryFile behind uploads, which io.TextIOWrapper can't wrap
+    before Python 3.11.
+    """
+    for number, line in enumerate(stream):
+        yield line.decode('utf-8-sig' if number == 0 else 'utf-8')
+
+def iter_import_rows(stream, fmt):
+    """Yield (row number, row) pairs from a binary stream.
+
+    CSV and JSON Lines are read incrementally. A plain JSON array has to be
+    parsed in one go, so prefer jsonl for very large catalogues. A row that
+    cannot be parsed is yielded as the ValueError describing the problem.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(_iter_text_lines(stream))
+        for number, row in enumerate(reader, start=2):
+            yield number, row
+    elif fmt == 'jsonl':
+        for number, line in enumerate(_iter_text_lines(stream), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, ValueError(f'Invalid JSON: {e}')
+    else:
+        rows = json.load(stream)
+        if not isinstance(rows, list):
+            raise ValueError('JSON imports must be an array of items')
+        for number, row in enumerate(rows, start=1):
+            yield number, row
+
+def _import_text(row, field, max_length=None, required=False):
+    value = row.get(field)
+    value = str(value).strip() if value is not None else ''
+    if required and not value:
+        raise ValueError(f'{field} is required')
+    if max_length and len(value) > max_length:
+        raise ValueError(f'{field} must be at most {max_length} characters')
+    return value or None
+
+def _import_bool(row, field, default):
+    value = row.get(field)
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    if str(value).strip().lower() in ('1', 'true', 'yes', 'y', 'on'):
+        return True
+    if str(value).strip().lower() in ('0', 'false', 'no', 'n', 'off'):
+        return False
+    raise ValueError(f'{field} must be true or false')
+
+def parse_import_row(row):
+    """Validate one import row and split it into category and item values"""
+    if not isinstance(row, dict):
+        raise ValueError('Each item must be an object')
+    try:
+        price = float(row.get('price'))
+    except (TypeError, ValueError):
+        raise ValueError('price must be a number')
+    if price < 0:
+        raise ValueError('price cannot be negative')
+
+    return {
+        'category': {
+            'name': _import_text(row, 'category', 50, required=True),
+            'description': _import_text(row, 'category_description'),
+            'icon': _import_text(row, 'category_icon', 50),
+        },
+        'item': {
+            'name': _import_text(row, 'name', 100, required=True),
+            'description': _import_text(row, 'description'),
+            'price': price,
+            'available': _import_bool(row, 'available', True),
+            'is_spicy': _import_bool(row, 'is_spicy', False),
+            'is_vegetarian': _import_bool(row, 'is_vegetarian', False),
+            'prep_time': _import_text(row, 'prep_time', 20),
+            'image_url': _import_text(row, 'image_url', 200),
+        },
+        # Updates only touch the columns the file actually has
+        'present': {field for field in row if field in MENU_FILE_FIELDS},
+    }
+
+def _changed_rows(model, updates):
+    """Drop the {id: values} updates that would leave their row as it is"""
+    if not updates:
+        return []
+    current = db.session.execute(
+        db.select(model.__table__).where(model.id.in_(list(updates)))
+    ).mappings()
+    # Imports read empty text as None, where the admin forms store ''
+    return [updates[row['id']] for row in current
+            if any((None if row[field] == '' else row[field]) != value
+                   for field, value in updates[row['id']].items())]
+
+def _updated_rows(model, updates):
+    """Re-select rows after a bulk UPDATE, which leaves loaded objects stale"""
+    return db.session.scalars(
+        db.select(model).where(model.id.in_([update['id'] for update in updates]))
+        .execution_options(populate_existing=True)
+    ).all()
+
+def _import_batch(batch, categories, updated_categories, existing_items, report):
+    """Write one batch of validated rows with bulk statements.
+
+    Rows that already hold the imported values are skipped, and everything
+    written is logged to the change feed as it now stands in the database.
+    """
+    changes = []
+
+    # Categories first, so new items can reference them
+    new_categories = {}
+    category_updates = {}
+    for values in batch:
+        category = values['category']
+        if category['name'] not in categories:
+            new_categories.setdefault(category['name'], category)
+        elif category['name'] not in updated_categories and (category['description'] or category['icon']):
+            updated_categories.add(category['name'])
+            update = {'id': categories[category['name']]}
+            update.update({field: category[field] for field in ('description', 'icon') if category[field]})
+            category_updates[update['id']] = update
+    if new_categories:
+        created = db.session.scalars(
+            db.insert(Category).returning(Category, sort_by_parameter_order=True),
+            list(new_categories.values())
+        ).all()
+        for category in created:
+            categories[category.name] = category.id
+            updated_categories.add(category.name)
+            changes.append(menu_change_values('create', category))
+        report['categories_created'] += len(created)
+    category_updates = _changed_rows(Category, category_updates)
+    if category_updates:
+        db.session.execute(db.update(Category), category_updates)
+        changes.extend(menu_change_values('update', category) for category in _updated_rows(Category, category_updates))
+        report['categories_updated'] += len(category_updates)
+
+    # Then items: rows repeated within the file update the earlier row
+    inserts = {}
+    updates = {}
+    for values in batch:
+        item = dict(values['item'], category_id=categories[values['category']['name']])
+        key = (item['category_id'], item['name'])
+        if key in existing_items:
+            update = updates.setdefault(existing_items[key], {'id': existing_items[key]})
+            update.update({field: value for field, value in item.items()
+                           if field in values['present'] or field == 'category_id'})
+        else:
+            inserts[key] = item
+    if inserts:
+        created = db.session.scalars(
+            db.insert(MenuItem).returning(MenuItem, sort_by_parameter_order=True),
+            list(inserts.values())
+        ).all()
+        for item in created:
+            existing_items[(item.category_id, item.name)] = item.id
+            changes.append(menu_change_values('create', item))
+        report['created'] += len(created)
+    changed = _changed_rows(MenuItem, updates)
+    if changed:
+        db.session.execute(db.update(MenuItem), changed)
+        changes.extend(menu_change_values('update', item) for item in _updated_rows(MenuItem, changed))
+        report['updated'] += len(changed)
+    report['unchanged'] += len(updates) - len(changed)
+
+    if changes:
+        db.session.execute(db.insert(MenuChange), changes)
+
+def import_menu(rows, batch_size=None):
+    """Upsert categories and items from (row number, row) pairs in one transaction.
+
+    Invalid rows are skipped and listed in the report's errors; every valid row
+    is committed together, with a single menu version bump. Items that already
+    match their row are counted as unchanged and leave the version alone.
+    """
+    batch_size = batch_size or current_app.config['MENU_IMPORT_BATCH_SIZE']
+    report = {'created': 0, 'updated': 0, 'unchanged': 0, 'categories_created': 0, 'categories_updated': 0,
+              'errors': []}
+    categories = dict(db.session.execute(db.select(Category.name, Category.id)).all())
+    existing_items = {
+        (category_id, name): item_id
+        for item_id, category_id, name in db.session.execute(
+            db.select(MenuItem.id, MenuItem.category_id, MenuItem.name)
+        )
+    }
+    updated_categories = set()
+
+    try:
+        batch = []
+        for number, row in rows:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                batch.append(parse_import_row(row))
+            except ValueError as e:
+                report['errors'].append({'row': number, 'error': str(e)})
+                continue
+            if len(batch) >= batch_size:
+                _import_batch(batch, categories, updated_categories, existing_items, report)
+                batch = []
+        if batch:
+            _import_batch(batch, categories, updated_categories, existing_items, report)
+
+        if report['created'] or report['updated'] or report['categories_created'] or report['categories_updated']:
+            bump_menu_version()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return report
+
+def iter_export_rows():
+    """Yield every item as a MENU_FILE_FIELDS dict, in menu order"""
+    query = (
+        db.select(Category.name, Category.description, Category.icon, MenuItem.name, MenuItem.description,
+                  MenuItem.price, MenuItem.available, MenuItem.is_spicy, MenuItem.is_vegetarian,
+                  MenuItem.prep_time, MenuItem.image_url)
+        .join(MenuItem, MenuItem.category_id == Category.id)
+        .order_by(Category.id, MenuItem.id)
+        .execution_options(yield_per=1000)
+    )
+    for row in db.session.execute(query):
+        yield dict(zip(MENU_FILE_FIELDS, row))
+
+def stream_menu_export(fmt, chunk_rows=500):
+    """Yield the exported menu as text chunks in the given format"""
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=MENU_FILE_FIELDS)
+        writer.writeheader()
+        for number, row in enumerate(iter_export_rows(), start=1):
+            writer.writerow(row)
+            if number % chunk_rows == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    elif fmt == 'jsonl':
+        for row in iter_export_rows():
+            yield json.dumps(row, ensure_ascii=False) + '\n'
+    else:
+        yield '['
+        for number, row in enumerate(iter_export_rows()):
+            yield (',\n' if number else '\n') + json.dumps(row, ensure_ascii=False)
+        yield '\n]\n'
+
+@main.route('/admin/export')
+def export_menu():
+    """Download every category and item as CSV, JSON or JSON Lines (?format=)"""
+    try:
+        fmt = menu_file_format(fmt=request.args.get('format'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    response = current_app.response_class(stream_with_context(stream_menu_export(fmt)), mimetype=MENU_FILE_FORMATS[fmt])
+    response.headers.set('Content-Disposition', 'attachment', filename=f'naija-flavours-menu.{fmt}')
+    return response
+
+@main.route('/admin/import', methods=['POST'])
+def import_menu_route():
+    """Import a menu file uploaded as 'file', or sent as the raw request body.
+
+    Clients that ask for JSON get the import report back; the admin form gets a
+    flash message and is redirected to the dashboard.
+    """
+    wants_json = wants_json_response()
+    upload = request.files.get('file')
+    try:
+        if upload is not None and upload.filename:
+            fmt = menu_file_format(upload.filename, request.form.get('format') or request.args.get('format'))
+            stream = upload.stream
+        else:
+            fmt = menu_file_format(fmt=request.args.get('format') or MENU_FILE_MIMETYPES.get(request.mimetype))
+            stream = request.stream
+        report = import_menu(iter_import_rows(stream, fmt))
+    except Exception as e:
+        if wants_json:
+            return jsonify({'error': str(e)}), 400
+        flash(f'Error importing menu: {str(e)}', 'error')
+        return redirect(url_for('main.admin'))
+
+    if wants_json:
+        return jsonify(report)
+    flash(f"Menu imported: {report['created']} items added, {report['updated']} updated, "
+          f"{report['unchanged']} unchanged, {report['categories_created']} new categories.", 'success')
+    for error in report['errors'][:10]:
+        flash(f"Row {error['row']}: {error['error']}", 'error')
+    if len(report['errors']) > 10:
+        flash(f"...and {len(report['errors']) - 10} more rows with errors", 'error')
+    return redirect(url_for('main.admin'))
+
+@main.cli.command('import-menu')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', help='csv, json or jsonl (default: from the file extension)')
+def import_menu_command(path, fmt):
+    """Import categories and items from a CSV/JSON/JSON Lines file"""
+    with open(path, 'rb') as f:
+        report = import_menu(iter_import_rows(f, menu_file_format(path, fmt)))
+    click.echo(f"✅ {report['created']} items added, {report['updated']} updated, {report['unchanged']} unchanged, "
+               f"{report['categories_created']} categories added, {report['categories_updated']} updated")
+    for error in report['errors']:
+        click.echo(f"⚠️ Row {error['row']}: {error['error']}", err=True)
+
+@main.cli.command('export-menu')
+@click.argument('path', type=click.Path(dir_okay=False, allow_dash=True))
+@click.option('--format', 'fmt', help='csv, json or jsonl (default: from the file extension)')
+def export_menu_command(path, fmt):
+    """Export every category and item to a file ('-' for stdout)"""
+    fmt = menu_file_format(None if path == '-' else path, fmt)
+    with click.open_file(path, 'w', encoding='utf-8') as f:
+        for chunk in stream_menu_export(fmt):
+            f.write(chunk)
+
+# JSON API
+# Read-only views of the menu for kiosks and delivery partners. Everything is
+# served from the menu snapshot, and responses carry the menu version as their
+# ETag so a client polling for changes gets a 304 without any serialization.
+API_ITEM_FIELDS = ('id', 'name', 'description', 'price', 'category_id', 'available',
+                   'is_spicy', 'is_vegetarian', 'prep_time', 'image_url', 'created_at')
+API_CATEGORY_FIELDS = ('id', 'name', 'description', 'icon', 'item_count')
+API_DEFAULT_LIMIT = 50
+API_MAX_LIMIT = 500
+
+class ApiError(Exception):
+    """Invalid API request; reported to the client as a 400"""
+
+@main.app_errorhandler(ApiError)
+def handle_api_error(e):
+    return jsonify({'error': str(e)}), 400
+
+def parse_bool_arg(name):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ApiError(f'{name} must be true or false')
+
+def parse_number_arg(name, type=float):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return type(value)
+    except ValueError:
+        raise ApiError(f'{name} must be a number')
+
+def parse_fields_arg(allowed):
+    """Return the fields requested with ?fields=a,b,c, or all of them"""
+    value = request.args.get('fields')
+    if not value:
+        return allowed
+    fields = tuple(field.strip() for field in value.split(',') if field.strip())
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def encode_cursor(last_id):
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        return int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ApiError('Invalid cursor')
+
+def paginate(rows, ids):
+    """Page through rows sorted by id using ?cursor= and ?limit=.
+
+    ids is the sorted list of row ids, so the cursor position is found by bisection.
+    """
+    limit = parse_number_arg('limit', int)
+    if limit is None:
+        limit = API_DEFAULT_LIMIT
+    if not 1 <= limit <= API_MAX_LIMIT:
+        raise ApiError(f'limit must be between 1 and {API_MAX_LIMIT}')
+    start = 0
+    cursor = request.args.get('cursor')
+    if cursor:
+        start = bisect.bisect_right(ids, decode_cursor(cursor))
+    page = rows[start:start + limit]
+    next_cursor = encode_cursor(page[-1]['id']) if page and start + limit < len(rows) else None
+    return page, next_cursor
+
+def project(row, fields):
+    return {field: row[field].isoformat() if isinstance(row[field], datetime) else row[field]
+            for field in fields}
+
+def api_response(snapshot, build_payload):
+    """JSON response validated by the menu version; build_payload only runs when the client is out of date"""
+    etag = f"api-v{snapshot['version']}"
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        payload = build_payload()
+        payload['version'] = snapshot['version']
+        response = jsonify(payload)
+    response.set_etag(etag)
+    if snapshot['updated_at'] is not None:
+        response.last_modified = snapshot['updated_at']
+    response.cache_control.no_cache = True
+    return response
+
+@main.route('/api/menu')
+def api_menu():
+    """The public menu: categories with their available items, in menu order"""
+    fields = parse_fields_arg(API_ITEM_FIELDS)
+    snapshot = get_menu_snapshot()
+
+    def build_payload():
+        return {'categories': [
+            dict(section['category'], items=[project(item, fields) for item in section['menu_items']])
+            for section in snapshot['data']['menu_sections']
+            if section['menu_items']
+        ]}
+
+    return api_response(snapshot, build_payload)
+
+@main.route('/api/categories')
+def api_categories():
+    """All categories, paginated by id"""
+    fields = parse_fields_arg(API_CATEGORY_FIELDS)
+    snapshot = get_menu_snapshot()
+
+    def build_payload():
+        item_counts = {}
+        for item in snapshot['data']['all_items']:
+            item_counts[item['category_id']] = item_counts.get(item['category_id'], 0) + 1
+        categories = sorted(
+            (dict(category, item_count=item_counts.get(category['id'], 0))
+             for category in snapshot['data']['categories']),
+            key=lambda category: category['id']
+        )
+        page, next_cursor = paginate(categories, [category['id'] for category in categories])
+        return {'data': [project(category, fields) for category in page], 'next_cursor': next_cursor}
+
+    return api_response(snapshot, build_payload)
+
+@main.route('/api/items')
+def api_items():
+    """Menu items, paginated by id.
+
+    Filters: available, is_spicy, is_vegetarian (true/false), min_price, max_price
+    and category (category id).
+    """
+    fields = parse_fields_arg(API_ITEM_FIELDS)
+    filters = {name: parse_bool_arg(name) for name in ('available', 'is_spicy', 'is_vegetarian')}
+    min_price = parse_number_arg('min_price')
+    max_price = parse_number_arg('max_price')
+    category_id = parse_number_arg('category', int)
+    snapshot = get_menu_snapshot()
+
+    def build_payload():
+        items = [
+            item for item in snapshot['data']['all_items']
+            if all(value is None or item[name] == value for name, value in filters.items())
+            and (min_price is None or item['price'] >= min_price)
+            and (max_price is None or item['price'] <= max_price)
+            and (category_id is None or item['category_id'] == category_id)
+        ]
+        page, next_cursor = paginate(items, [item['id'] for item in items])
+        return {'data': [project(item, fields) for item in page], 'next_cursor': next_cursor}
+
+    return api_response(snapshot, build_payload)
+
+# Change feed
+# Every admin edit is logged in MenuChange, so integrations can fetch just the
+# deltas since the last sequence number they saw instead of the whole menu.
+# Open /menu pages poll the same log, which costs a 304 while nothing changes.
+# The Server-Sent Events stream is for a few integrations only: every open
+# stream holds a worker thread, so only MENU_STREAM_MAX_OPEN are allowed per
+# worker.
+MENU_STREAM_HEARTBEAT = 15
+_open_streams = {'count': 0}
+_open_streams_lock = threading.Lock()
+
+def load_menu_changes(since, limit=API_MAX_LIMIT):
+    changes = (
+        MenuChange.query
+        .filter(MenuChange.id > since)
+        .order_by(MenuChange.id)
+        .limit(limit)
+        .all()
+    )
+    return [change.to_dict() for change in changes]
+
+@main.route('/api/menu/changes')
+def api_menu_changes():
+    """Changes with a sequence number greater than ?since=, oldest first.
+
+    The feed is not saved with the last known good menu, so it answers 503
+    while the database is unreachable and clients keep their current copy.
+    """
+    since = parse_number_arg('since', int) or 0
+    limit = parse_number_arg('limit', int)
+    if limit is None:
+        limit = API_MAX_LIMIT
+    if not 1 <= limit <= API_MAX_LIMIT:
+        raise ApiError(f'limit must be between 1 and {API_MAX_LIMIT}')
+
+    def build_payload():
+        changes = load_menu_changes(since, limit)
+        return {
+            'changes': changes,
+            'last_seq': changes[-1]['seq'] if changes else since,
+            'has_more': len(changes) == limit,
+        }
+
+    try:
+        snapshot = get_menu_snapshot()
+        if not g.get('menu_stale'):
+            return api_response(snapshot, build_payload)
+    except DatabaseUnavailable:
+        pass
+    except DB_UNAVAILABLE_ERRORS:
+        db.session.rollback()
+        record_db_failure()
+    return database_unavailable_response('Menu changes are unavailable while the database is unreachable')
+
+@main.route('/api/menu/changes/stream')
+def api_menu_changes_stream():
+    """Server-Sent Events stream of menu changes.
+
+    Resumes from the Last-Event-ID header (sent automatically by EventSource on
+    reconnect) or ?since=. The stream ends after MENU_STREAM_TIMEOUT seconds and
+    the browser reconnects, so long-lived connections don't pin a worker forever.
+    """
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = parse_number_arg('since', int) or 0
+    with _open_streams_lock:
+        if _open_streams['count'] >= current_app.config['MENU_STREAM_MAX_OPEN']:
+            response = jsonify({'error': 'Too many open change streams; poll /api/menu/changes instead'})
+            response.status_code = 503
+            response.headers['Retry-After'] = '30'
+            return response
+        _open_streams['count'] += 1
+
+    def stream(last_seq):
+        yield 'retry: 5000\n\n'
+        started = last_beat = time.monotonic()
+        version = None
+        while time.monotonic() - started < current_app.config['MENU_STREAM_TIMEOUT']:
+            try:
+                current = get_menu_version()
+                if current != version:
+                    version = current
+                    for change in load_menu_changes(last_seq):
+                        last_seq = change['seq']
+                        yield f"id: {last_seq}\nevent: change\ndata: {json.dumps(change)}\n\n"
+            finally:
+                # Don't hold a connection from the pool between polls
+                db.session.close()
+            if time.monotonic() - last_beat >= MENU_STREAM_HEARTBEAT:
+                last_beat = time.monotonic()
+                yield ': keep-alive\n\n'
+            time.sleep(current_app.config['MENU_STREAM_POLL_INTERVAL'])
+
+    response = current_app.response_class(stream_with_context(stream(since)), mimetype='text/event-stream')
+    response.call_on_close(_close_stream)
+    response.cache_control.no_cache = True
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def _close_stream():
+    with _open_streams_lock:
+        _open_streams['count'] -= 1
+
+# Menu search
+# Customers search item names and descriptions from the QR menu. Each worker
+# keeps an inverted index of the available items, built once from the menu
+# snapshot and then kept current by replaying the change feed, so queries are
+# answered from memory: whole words and prefixes through a sorted vocabulary,
+# typos through the letter-deletion neighbourhood of every word, and facet
+# counts by set intersections. With SEARCH_BACKEND=postgres the text matching
+# runs as a Postgres full-text query instead; filters and facets still come
+# from the index.
+SEARCH_FIELD_WEIGHTS = {'name': 3.0, 'description': 1.0}
+SEARCH_MATCH_WEIGHTS = {'exact': 1.0, 'prefix': 0.6, 'typo': 0.4}
+SEARCH_MIN_PREFIX = 2
+# (value, label, from, up to but excluding); prices are in naira, prep times in minutes
+SEARCH_PRICE_BANDS = (
+    ('under-1000', 'Under ₦1,000', 0, 1000),
+    ('1000-2500', '₦1,000 – ₦2,500', 1000, 2500),
+    ('2500-5000', '₦2,500 – ₦5,000', 2500, 5000),
+    ('5000-plus', '₦5,000 and up', 5000, None),
+)
+SEARCH_PREP_TIME_BANDS = (
+    ('up-to-10', 'Up to 10 min', 0, 11),
+    ('11-20', '11 – 20 min', 11, 21),
+    ('21-30', '21 – 30 min', 21, 31),
+    ('over-30', 'Over 30 min', 31, None),
+)
+SEARCH_FACETS = ('category', 'is_spicy', 'is_vegetarian', 'price', 'prep_time')
+SEARCH_FLAG_LABELS = {
+    'is_spicy': {True: 'Spicy', False: 'Not spicy'},
+    'is_vegetarian': {True: 'Vegetarian', False: 'Not vegetarian'},
+}
+# A longer backlog of changes is cheaper to rebuild from the snapshot than to replay
+SEARCH_MAX_REPLAY = 500
+# Expression behind the Postgres GIN index created by init-db
+SEARCH_DOCUMENT_SQL = "to_tsvector('simple', name || ' ' || coalesce(description, ''))"
+
+_search_index = {'index': None}
+_search_index_lock = threading.Lock()
+_search_word_re = re.compile(r'\w+')
+
+def search_words(text):
+    """Lowercase, accent-free words of a piece of text"""
+    text = text or ''
+    if not text.isascii():
+        text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return _search_word_re.findall(text.casefold())
+
+def _max_typos(word):
+    if len(word) < 4 or not word.isalpha():
+        return 0
+    return 1 if len(word) < 8 else 2
+
+def _deletions(word, depth):
+    """The word with up to depth letters removed"""
+    found = frontier = {word}
+    for _ in range(depth):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        found = found | frontier
+    return found
+
+def _edit_distance(a, b, limit):
+    """Damerau-Levenshtein distance (adjacent swaps count as one edit), or limit + 1 if it is larger"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], before[j - 2] + 1)
+        before, previous = previous, current
+    return previous[-1]
+
+def _band(bands, value):
+    if value is None:
+        return None
+    for band, _, lowest, highest in bands:
+        if value >= lowest and (highest is None or value < highest):
+            return band
+    return None
+
+def _prep_minutes(prep_time):
+    """The longest time in a prep time like '25-30 min'"""
+    minutes = [int(number) for number in re.findall(r'\d+', prep_time or '')]
+    return max(minutes) if minutes else None
+
+class SearchIndex:
+    """Inverted index and facet sets over the available items of one menu version.
+
+    Not thread-safe; search_menu() serializes access with _search_index_lock.
+    """
+
+    def __init__(self, version, updated_at, change_seq, categories, items):
+        self.version = version
+        self.updated_at = updated_at
+        self.change_seq = change_seq
+        self.categories = {category['id']: category for category in categories}
+        self.items = {}
+        self.item_words = {}
+        self.item_facets = {}
+        self.item_names = {}
+        self.by_name = None     # item ids sorted by name, built when first needed
+        self.postings = {}      # word -> {item id: weight}
+        self.vocabulary = []    # sorted words, for prefix lookups
+        self.typos = {}         # word with letters removed -> the words it came from
+        self.facets = {facet: {} for facet in SEARCH_FACETS}  # facet -> value -> item ids
+        self._building = True
+        for item in items:
+            self.add(item)
+        self.vocabulary.sort()
+        self._building = False
+
+    def add(self, item):
+        words = {}
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            for word in search_words(item[field]):
+                words[word] = max(words.get(word, 0), weight)
+        for word, weight in words.items():
+            postings = self.postings.get(word)
+            if postings is None:
+                postings = self.postings[word] = {}
+                if self._building:
+                    self.vocabulary.append(word)
+                else:
+                    bisect.insort(self.vocabulary, word)
+                for variant in _deletions(word, _max_typos(word)):
+                    self.typos.setdefault(variant, set()).add(word)
+            postings[item['id']] = weight
+
+        facets = {
+            'category': item['category_id'],
+            'is_spicy': bool(item['is_spicy']),
+            'is_vegetarian': bool(item['is_vegetarian']),
+            'price': _band(SEARCH_PRICE_BANDS, item['price']),
+            'prep_time': _band(SEARCH_PREP_TIME_BANDS, _prep_minutes(item['prep_time'])),
+        }
+        for facet, value in facets.items():
+            if value is not None:
+                self.facets[facet].setdefault(value, set()).add(item['id'])
+        self.items[item['id']] = item
+        self.item_words[item['id']] = words
+        self.item_facets[item['id']] = facets
+        self.item_names[item['id']] = item['name'].casefold()
+        self.by_name = None
+
+    def remove(self, item_id):
+        if item_id not in self.items:
+            return
+        del self.items[item_id]
+        del self.item_names[item_id]
+        self.by_name = None
+        for word in self.item_words.pop(item_id):
+            postings = self.postings[word]
+            del postings[item_id]
+            if not postings:
+                del self.postings[word]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, word)]
+                for variant in _deletions(word, _max_typos(word)):
+                    self.typos[variant].discard(word)
+                    if not self.typos[variant]:
+                        del self.typos[variant]
+        for facet, value in self.item_facets.pop(item_id).items():
+            if value is not None:
+                self.facets[facet][value].discard(item_id)
+                if not self.facets[facet][value]:
+                    del self.facets[facet][value]
+
+    def apply_change(self, change):
+        """Bring the index up to date with one change-feed entry"""
+        if change['entity'] == 'category':
+            if change['action'] == 'delete':
+                self.categories.pop(change['entity_id'], None)
+                for item_id in list(self.facets['category'].get(change['entity_id'], ())):
+                    self.remove(item_id)
+            else:
+                self.categories[change['entity_id']] = change['data']
+            return
+        self.remove(change['entity_id'])
+        if change['action'] != 'delete' and change['data']['available']:
+            self.add(change['data'])
+
+    def expand(self, term):
+        """Yield (word, kind) for every indexed word the query term matches"""
+        if term in self.postings:
+            yield term, 'exact'
+        if len(term) >= SEARCH_MIN_PREFIX:
+            for i in range(bisect.bisect_right(self.vocabulary, term), len(self.vocabulary)):
+                if not self.vocabulary[i].startswith(term):
+                    break
+                yield self.vocabulary[i], 'prefix'
+        limit = _max_typos(term)
+        if limit:
+            candidates = set()
+            for variant in _deletions(term, limit):
+                candidates |= self.typos.get(variant, set())
+            for word in candidates:
+                if not word.startswith(term) and word != term and _edit_distance(term, word, limit) <= limit:
+                    yield word, 'typo'
+
+    def match(self, terms):
+        """Score the items matching every term"""
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for word, kind in self.expand(term):
+                factor = SEARCH_MATCH_WEIGHTS[kind]
+                for item_id, weight in self.postings[word].items():
+                    if weight * factor > term_scores.get(item_id, 0):
+                        term_scores[item_id] = weight * factor
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {item_id: score + term_scores[item_id]
+                          for item_id, score in scores.items() if item_id in term_scores}
+            if not scores:
+                break
+        return scores
+
+    def search(self, terms, filters, limit, offset, scores=None):
+        """Filter, rank and facet the items matching the query terms.
+
+        filters maps a facet to the set of values to keep. scores, when given,
+        come from another text backend and replace the index's own matching.
+        Facet counts for each facet ignore that facet's own filter, so the
+        other values still show how many items they would add.
+        """
+        if scores is None and terms:
+            scores = self.match(terms)
+        matched = set(self.items) if scores is None else set(scores).intersection(self.items)
+        selected = {
+            facet: set().union(*(self.facets[facet].get(value, ()) for value in values))
+            for facet, values in filters.items()
+        }
+        results = matched.intersection(*selected.values())
+
+        facets = {}
+        for facet in SEARCH_FACETS:
+            others = [ids for name, ids in selected.items() if name != facet]
+            base = matched.intersection(*others)
+            # Browsing without a query or other filters counts every item
+            unfiltered = len(base) == len(self.items)
+            chosen = filters.get(facet, ())
+            facets[facet] = []
+            for value, ids in self.facets[facet].items():
+                count = len(ids) if unfiltered else len(ids & base)
+                # Values that would empty the results are left out, unless already selected
+                if count or value in chosen:
+                    facets[facet].append({'value': value, 'label': self.facet_label(facet, value),
+                                          'count': count, 'selected': value in chosen})
+            facets[facet].sort(key=self.facet_order(facet))
+
+        names = self.item_names
+        if scores:
+            page = heapq.nsmallest(offset + limit, results, key=lambda item_id: (-scores[item_id], names[item_id]))
+        elif len(results) * 8 < len(self.items):
+            page = heapq.nsmallest(offset + limit, results, key=names.__getitem__)
+        else:
+            # Most items match: walk the name order instead of sorting them all
+            if self.by_name is None:
+                self.by_name = sorted(self.items, key=names.__getitem__)
+            page = list(itertools.islice((item_id for item_id in self.by_name if item_id in results),
+                                         offset + limit))
+        page = page[offset:]
+        return {
+            'version': self.version,
+            'updated_at': self.updated_at,
+            'total': len(results),
+            'items': [dict(self.items[item_id], score=round(scores[item_id], 3) if scores else None,
+                           category=self.categories.get(self.items[item_id]['category_id'], {}).get('name'))
+                      for item_id in page],
+            'facets': facets,
+        }
+
+    def facet_label(self, facet, value):
+        if facet == 'category':
+            category = self.categories.get(value)
+            return f"{category['icon'] or ''} {category['name']}".strip() if category else str(value)
+        if facet in SEARCH_FLAG_LABELS:
+            return SEARCH_FLAG_LABELS[facet][value]
+        bands = SEARCH_PRICE_BANDS if facet == 'price' else SEARCH_PREP_TIME_BANDS
+        return next(label for band, label, _, _ in bands if band == value)
+
+    def facet_order(self, facet):
+        if facet == 'category':
+            return lambda option: option['value']
+        if facet in SEARCH_FLAG_LABELS:
+            return lambda option: not option['value']
+        bands = [band[0] for band in (SEARCH_PRICE_BANDS if facet == 'price' else SEARCH_PREP_TIME_BANDS)]
+        return lambda option: bands.index(option['value'])
+
+def build_search_index(snapshot=None):
+    snapshot = snapshot or get_menu_snapshot()
+    data = snapshot['data']
+    return SearchIndex(snapshot['version'], snapshot['updated_at'], data['change_seq'],
+                       data['categories'], data['menu_items'])
+
+def sync_search_index():
+    """Return the search index for the current menu version; call with _search_index_lock held.
+
+    Admin edits since the index was built are replayed from the change feed.
+    The index is rebuilt from the snapshot instead when there are too many of
+    them, when one of them cannot be applied, or when the version moved
+    without any change being logged. While the database is unreachable, the
+    last known good snapshot is searched.
+    """
+    index = _search_index['index']
+    try:
+        version = None if db_breaker_is_open() else get_menu_version()
+    except DB_UNAVAILABLE_ERRORS:
+        db.session.rollback()
+        record_db_failure()
+        version = None
+    if version is None:
+        snapshot = get_menu_snapshot()
+        if index is None or index.version != snapshot['version']:
+            index = _search_index['index'] = build_search_index(snapshot)
+        return index
+    if index is not None and index.version == version:
+        return index
+    if index is not None:
+        changes = load_menu_changes(index.change_seq, SEARCH_MAX_REPLAY + 1)
+        if changes and len(changes) <= SEARCH_MAX_REPLAY:
+            # A replay that fails part way leaves the index half updated, so
+            # it is dropped before replaying and only put back once complete
+            _search_index['index'] = None
+            try:
+                for change in changes:
+                    index.apply_change(change)
+            except Exception:
+                record_swallowed_exception('search_replay')
+            else:
+                index.version = version
+                index.updated_at = _menu_version_state['updated_at']
+                index.change_seq = changes[-1]['seq']
+                _search_index['index'] = index
+                return index
+    index = _search_index['index'] = build_search_index()
+    return index
+
+def match_postgres(terms):
+    """Full-text match of every term as a prefix, scored by ts_rank"""
+    rows = db.session.execute(
+        db.select(MenuItem.id, db.text(f"ts_rank({SEARCH_DOCUMENT_SQL}, to_tsquery('simple', :query))"))
+        .where(db.text(f"{SEARCH_DOCUMENT_SQL} @@ to_tsquery('simple', :query)"), MenuItem.available.is_(True)),
+        {'query': ' & '.join(f'{term}:*' for term in terms)}
+    )
+    return {item_id: float(rank) for item_id, rank in rows}
+
+def search_menu(query, filters, limit, offset=0):
+    """Search the available items; see SearchIndex.search() for the result"""
+    started = time.perf_counter()
+    terms = search_words(query)
+    scores = None
+    if (terms and current_app.config['SEARCH_BACKEND'] == 'postgres' and db.engine.dialect.name == 'postgresql'
+            and not db_breaker_is_open()):
+        scores = match_postgres(terms)
+    with _search_index_lock:
+        result = sync_search_index().search(terms, filters, limit, offset, scores)
+    observe('search_seconds', time.perf_counter() - started)
+    return result
+
+def parse_search_filters():
+    """Facet filters from the query string, e.g. ?category=2&category=5&is_spicy=true&price=under-1000"""
+    filters = {}
+    categories = request.args.getlist('category')
+    if categories:
+        try:
+            filters['category'] = {int(value) for value in categories}
+        except ValueError:
+            raise ApiError('category must be a category id')
+    for facet in SEARCH_FLAG_LABELS:
+        value = parse_bool_arg(facet)
+        if value is not None:
+            filters[facet] = {value}
+    for facet, bands in (('price', SEARCH_PRICE_BANDS), ('prep_time', SEARCH_PREP_TIME_BANDS)):
+        values = set(request.args.getlist(facet))
+        allowed = {band[0] for band in bands}
+        if values - allowed:
+            raise ApiError(f"{facet} must be one of: {', '.join(sorted(allowed))}")
+        if values:
+            filters[facet] = values
+    return filters
+
+def parse_search_paging(default_limit):
+    limit = parse_number_arg('limit', int)
+    if limit is None:
+        limit = default_limit
+    if not 1 <= limit <= API_MAX_LIMIT:
+        raise ApiError(f'limit must be between 1 and {API_MAX_LIMIT}')
+    offset = parse_number_arg('offset', int) or 0
+    if offset < 0:
+        raise ApiError('offset cannot be negative')
+    return limit, offset
+
+@main.route('/api/search')
+def api_search():
+    """Search available items by name and description.
+
+    ?q= is matched word by word, by prefix and with typos forgiven; facet
+    filters are category, is_spicy, is_vegetarian, price and prep_time. Paged
+    with ?limit= and ?offset=.
+    """
+    fields = parse_fields_arg(API_ITEM_FIELDS)
+    filters = parse_search_filters()
+    limit, offset = parse_search_paging(API_DEFAULT_LIMIT)
+    result = search_menu(request.args.get('q', ''), filters, limit, offset)
+
+    def build_payload():
+        return {
+            'total': result['total'],
+            'data': [dict(project(item, fields), score=item['score']) for item in result['items']],
+            'facets': result['facets'],
+        }
+
+    return api_response(result, build_payload)
+
+SEARCH_PAGE_SIZE = 24
+
+def search_filter_url(facet, value):
+    """URL of the current search with one facet value switched on or off"""
+    args = request.args.copy()
+    args.pop('offset', None)
+    if facet in SEARCH_FLAG_LABELS:
+        value = 'true' if value else 'false'
+        if args.get(facet) == value:
+            args.pop(facet)
+        else:
+            args[facet] = value
+    else:
+        values = args.poplist(facet)
+        if str(value) in values:
+            values.remove(str(value))
+        else:
+            values.append(str(value))
+        args.setlist(facet, values)
+    return url_for('main.search', **args.to_dict(flat=False))
+
+@main.route('/search')
+def search():
+    """Search page for customers browsing from the QR code"""
+    query = request.args.get('q', '')
+    filters = parse_search_filters()
+    _, offset = parse_search_paging(SEARCH_PAGE_SIZE)
+    result = search_menu(query, filters, SEARCH_PAGE_SIZE, offset)
+    for facet, options in result['facets'].items():
+        for option in options:
+            option['url'] = search_filter_url(facet, option['value'])
+
+    args = request.args.to_dict(flat=False)
+    previous_url = next_url = None
+    if offset > 0:
+        previous_url = url_for('main.search', **dict(args, offset=max(offset - SEARCH_PAGE_SIZE, 0)))
+    if offset + SEARCH_PAGE_SIZE < result['total']:
+        next_url = url_for('main.search', **dict(args, offset=offset + SEARCH_PAGE_SIZE))
+    return render_template('search.html', query=query, result=result, offset=offset,
+                           filtered=bool(filters), previous_url=previous_url, next_url=next_url)
 
 # QR Code Generation
-@app.route('/qr-code')
-def generate_qr():
-    # Direct PDF download URL
-    pdf_url = request.host_url + 'qr-pdf'
-    
-    # Create QR code
+# A QR image depends only on the URL it encodes and how it is drawn, so encoded
+# images are memoized by (data, size, format, error correction) in a bounded LRU.
+QR_ERROR_CORRECTION_LEVELS = ('L', 'M', 'Q', 'H')
+QR_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+_qr_cache = OrderedDict()
+_qr_cache_lock = threading.Lock()
+
+def render_qr(data, size=10, fmt='png', error_correction='L'):
+    """Return (encoded variants, mimetype) for a QR code, encoding it only on a cache miss"""
+    key = (data, size, fmt, error_correction)
+    with _qr_cache_lock:
+        cached = _qr_cache.get(key)
+        if cached is not None:
+            _qr_cache.move_to_end(key)
+            return cached
+
+    import qrcode
+    import qrcode.image.svg
+
+    started = time.perf_counter()
     qr = qrcode.QRCode(
         version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
+        error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{error_correction}'),
+        box_size=size,
         border=4,
     )
-    qr.add_data(pdf_url)
+    qr.add_data(data)
     qr.make(fit=True)
-    
-    # Create image
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Save to bytes
+
+    # SVG is written as vector paths and skips PIL rasterization entirely
     img_io = io.BytesIO()
-    img.save(img_io, 'PNG')
-    img_io.seek(0)
-    
-    return send_file(img_io, mimetype='image/png')
+    if fmt == 'svg':
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage)
+        img.save(img_io)
+    else:
+        img = qr.make_image(fill_color="black", back_color="white")
+        img.save(img_io, 'PNG')
+    observe('qr_encode_seconds', time.perf_counter() - started, format=fmt)
 
-@app.route('/qr')
+    # Only the SVG benefits from gzip/brotli; PNG data is already deflated
+    cached = (encode_variants(img_io.getvalue(), compress=fmt == 'svg'), QR_FORMATS[fmt])
+    with _qr_cache_lock:
+        _qr_cache[key] = cached
+        while len(_qr_cache) > current_app.config['QR_CACHE_SIZE']:
+            _qr_cache.popitem(last=False)
+    return cached
+
+@main.route('/qr-code')
+def generate_qr():
+    """QR code pointing at the direct PDF download.
+
+    Optional query parameters: size (box size in pixels, 1-40), format (png or svg)
+    and ec (error correction level L, M, Q or H).
+    """
+    # Direct PDF download URL
+    pdf_url = request.host_url + 'qr-pdf'
+
+    size = request.args.get('size', 10, type=int)
+    fmt = request.args.get('format', 'png').lower()
+    error_correction = request.args.get('ec', 'L').upper()
+    if not 1 <= size <= 40 or fmt not in QR_FORMATS or error_correction not in QR_ERROR_CORRECTION_LEVELS:
+        return jsonify({'error': 'size must be 1-40, format png or svg, ec one of L, M, Q, H'}), 400
+
+    variants, mimetype = render_qr(pdf_url, size, fmt, error_correction)
+
+    return cached_response(
+        variants,
+        mimetype,
+        f"qr-{variants['digest']}",
+        max_age=current_app.config['QR_CACHE_MAX_AGE']
+    )
+
+@main.route('/qr')
 def qr_page():
     # Page to display the QR code
     menu_url = request.host_url + 'menu'
     return render_template('qr_page.html', menu_url=menu_url)
 
-@app.route('/qr-pdf')
+@main.route('/qr-pdf')
 def qr_pdf_download():
     """Route that directly downloads PDF when accessed via QR code"""
     flash('Thank you for scanning! Downloading menu...', 'success')
     return download_menu_pdf()
 
-@app.route('/download-menu-pdf')
-def download_menu_pdf():
-    """Generate and download the complete menu as a PDF"""
-    
+# Menu item images
+# Uploaded photos are stored once under the hash of their bytes, and resized
+# copies are made at upload time: 4:3 crops at a few widths, as WebP and JPEG.
+# A file's name changes whenever its content does, so everything under /images
+# is served as immutable. Pages pick a size with srcset and load photos lazily,
+# and the menu PDF embeds a small JPEG copy rather than the original.
+IMAGE_WIDTHS = (160, 320, 640)
+IMAGE_PDF_WIDTH = 320
+IMAGE_UPLOAD_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'gif'}
+# Resized copies: extension and encoder options per format
+IMAGE_FORMATS = {
+    'webp': ('webp', {'quality': 80}),
+    'jpeg': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+IMAGE_MAX_PIXELS = 40_000_000
+IMAGE_MAX_AGE = 365 * 24 * 3600
+IMAGE_NAME_PATTERN = re.compile(r'[0-9a-f]{32}(-\d+)?\.(jpg|png|webp|gif)')
+# An uploaded photo's URL; anything else in image_url (e.g. from an import) is used as is
+IMAGE_URL_PATTERN = re.compile(r'(.*/images/[0-9a-f]{32})\.(jpg|png|webp|gif)')
+
+def process_image(data, directory):
+    """Store an uploaded photo and its resized copies and return the photo's file name; runs in a pool process"""
+    from PIL import Image, ImageOps
+
+    image = Image.open(BytesIO(data))
+    extension = IMAGE_UPLOAD_FORMATS.get(image.format)
+    if extension is None:
+        raise ValueError('Photos must be JPEG, PNG, WebP or GIF images')
+    if image.width * image.height > IMAGE_MAX_PIXELS:
+        raise ValueError('Photo is too large')
+    key = hashlib.sha256(data).hexdigest()[:32]
+    name = f'{key}.{extension}'
+    if os.path.exists(os.path.join(directory, name)):
+        return name
+
+    image = ImageOps.exif_transpose(image).convert('RGB')
+    # Never enlarge: small photos get copies no wider than their largest 4:3 crop
+    largest = min(image.width, image.height * 4 // 3)
+    for width in IMAGE_WIDTHS:
+        size = min(width, largest)
+        resized = ImageOps.fit(image, (size, size * 3 // 4), Image.LANCZOS)
+        for format, (suffix, options) in IMAGE_FORMATS.items():
+            write_file_atomically(os.path.join(directory, f'{key}-{width}.{suffix}'),
+                                  lambda f: resized.save(f, format, **options))
+    # The original goes last, so its presence means the copies are all there
+    write_file_atomically(os.path.join(directory, name), data)
+    return name
+
+def save_uploaded_image(field='image'):
+    """Process the photo uploaded in field, if any, in the job pool and return its URL"""
+    upload = request.files.get(field)
+    if upload is None or not upload.filename:
+        return None
+    limit = current_app.config['IMAGE_MAX_BYTES']
+    data = upload.read(limit + 1)
+    if len(data) > limit:
+        raise ValueError(f'Photos must be at most {limit // (1024 * 1024)} MB')
+
+    directory = current_app.config['IMAGE_DIR']
+    os.makedirs(directory, exist_ok=True)
+    started = time.perf_counter()
+    name = submit_to_pool(process_image, data, directory).result(timeout=current_app.config['JOB_WAIT_TIMEOUT'])
+    observe('image_process_seconds', time.perf_counter() - started)
+    return url_for('main.item_image', name=name)
+
+def image_file(image_dir, image_url, width, format='jpeg'):
+    """Path of a resized copy of an uploaded photo, or None for other URLs and missing files"""
+    match = IMAGE_URL_PATTERN.fullmatch(image_url or '')
+    if match is None:
+        return None
+    name = f"{match.group(1).rpartition('/')[2]}-{width}.{IMAGE_FORMATS[format][0]}"
+    path = os.path.join(image_dir, name)
+    return path if os.path.exists(path) else None
+
+@main.app_template_global()
+def image_src(image_url, width=IMAGE_WIDTHS[1], format='jpeg'):
+    """URL of one resized copy of an uploaded photo; other URLs are returned unchanged"""
+    match = IMAGE_URL_PATTERN.fullmatch(image_url or '')
+    return f'{match.group(1)}-{width}.{IMAGE_FORMATS[format][0]}' if match else image_url
+
+@main.app_template_global()
+def image_srcset(image_url, format='jpeg'):
+    """srcset listing every resized copy of an uploaded photo; empty for other URLs"""
+    if not IMAGE_URL_PATTERN.fullmatch(image_url or ''):
+        return ''
+    return ', '.join(f'{image_src(image_url, width, format)} {width}w' for width in IMAGE_WIDTHS)
+
+@main.route('/images/<name>')
+def item_image(name):
+    """Serve an item photo or one of its copies; names are content hashes, so responses never go stale"""
+    if not IMAGE_NAME_PATTERN.fullmatch(name):
+        abort(404)
+    response = send_from_directory(current_app.config['IMAGE_DIR'], name, max_age=IMAGE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+# Menu PDF
+# ReportLab builds are CPU-bound, so they never run on a request thread: menu
+# PDFs (one per language) and posters are built as background jobs (see below)
+# and every worker serves the newest finished file. Admin edits queue a
+# rebuild, and customers scanning the QR code get the previous PDF meanwhile.
+_pdf_styles = {}
+_menu_pdf_stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'builds': 0,
+                   'build_errors': 0, 'last_build_seconds': None, 'total_build_seconds': 0.0}
+_menu_pdf_rebuild = {'running': False, 'again': False}
+_menu_pdf_rebuild_lock = threading.Lock()
+PDF_DEFAULT_LANGUAGE = 'en'
+# Fixed wording of the menu PDF and posters; item names and descriptions are printed as entered
+PDF_LANGUAGES = {
+    'en': {
+        'title': 'Naija Flavours Menu',
+        'subtitle': 'Authentic Nigerian Cuisine',
+        'generated': 'Generated on {date}',
+        'date_format': '%B %d, %Y',
+        'spicy': 'Spicy',
+        'vegetarian': 'Vegetarian',
+        'footer': "Thank you for choosing Naija Flavours!<br/>For orders and inquiries, "
+                  "<a href='https://naija-flavours.onrender.com/'><b>visit us online</b></a>.",
+        'scan': 'Scan to see our menu',
+    },
+    'fr': {
+        'title': 'Menu Naija Flavours',
+        'subtitle': 'Cuisine nigériane authentique',
+        'generated': 'Édité le {date}',
+        'date_format': '%d/%m/%Y',
+        'spicy': 'Épicé',
+        'vegetarian': 'Végétarien',
+        'footer': "Merci d'avoir choisi Naija Flavours !<br/>Pour commander ou nous contacter, "
+                  "<a href='https://naija-flavours.onrender.com/'><b>retrouvez-nous en ligne</b></a>.",
+        'scan': 'Scannez pour voir notre menu',
+    },
+}
+
+def get_pdf_styles():
+    """Create the ReportLab paragraph styles once and reuse them for every build"""
+    if _pdf_styles:
+        return _pdf_styles
+
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    _pdf_styles.update({
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=28,
+            textColor=colors.HexColor('#008751'),
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        'subtitle': ParagraphStyle(
+            'CustomSubtitle',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=colors.HexColor('#666666'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName='Helvetica'
+        ),
+        'date': ParagraphStyle(
+            'DateStyle',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.grey,
+            alignment=TA_CENTER
+        ),
+        'category': ParagraphStyle(
+            'CategoryStyle',
+            parent=styles['Heading2'],
+            fontSize=18,
+            textColor=colors.HexColor('#008751'),
+            spaceAfter=12,
+            spaceBefore=20,
+            fontName='Helvetica-Bold'
+        ),
+        'item_name': ParagraphStyle(
+            'ItemName',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=colors.HexColor('#1a1a1a'),
+            fontName='Helvetica-Bold'
+        ),
+        'item_desc': ParagraphStyle(
+            'ItemDesc',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=colors.HexColor('#666666'),
+            fontName='Helvetica'
+        ),
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.grey,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Oblique'
+        ),
+    })
+    return _pdf_styles
+
+def build_menu_pdf(menu_data, language=PDF_DEFAULT_LANGUAGE):
+    """Render the menu snapshot data into PDF bytes"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+
+    styles = get_pdf_styles()
+    image_dir = menu_data.get('image_dir')
+    labels = PDF_LANGUAGES[language]
+
     # Create a buffer to hold the PDF
     buffer = BytesIO()
-    
+
     # Create the PDF document
-    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=50, leftMargin=50, 
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=50, leftMargin=50,
                            topMargin=50, bottomMargin=50)
-    
+
     # Container for the 'Flowable' objects
     elements = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=colors.HexColor('#008751'),
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=12,
-        textColor=colors.HexColor('#666666'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica'
-    )
-    
-    category_style = ParagraphStyle(
-        'CategoryStyle',
-        parent=styles['Heading2'],
-        fontSize=18,
-        textColor=colors.HexColor('#008751'),
-        spaceAfter=12,
-        spaceBefore=20,
-        fontName='Helvetica-Bold'
-    )
-    
-    item_name_style = ParagraphStyle(
-        'ItemName',
-        parent=styles['Normal'],
-        fontSize=12,
-        textColor=colors.HexColor('#1a1a1a'),
-        fontName='Helvetica-Bold'
-    )
-    
-    item_desc_style = ParagraphStyle(
-        'ItemDesc',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#666666'),
-        fontName='Helvetica'
-    )
-    
-    # Add title
-    title = Paragraph("Naija Flavours Menu", title_style)
-    elements.append(title)
-    
-    # Add subtitle
-    subtitle = Paragraph("Authentic Nigerian Cuisine", subtitle_style)
-    elements.append(subtitle)
-    
-    # Add date
-    date_text = Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y')}", 
-                         ParagraphStyle('DateStyle', parent=styles['Normal'], 
-                                      fontSize=9, textColor=colors.grey, 
-                                      alignment=TA_CENTER))
-    elements.append(date_text)
+
+    # Add title, subtitle and date
+    elements.append(Paragraph(labels['title'], styles['title']))
+    elements.append(Paragraph(labels['subtitle'], styles['subtitle']))
+    elements.append(Paragraph(labels['generated'].format(date=datetime.now().strftime(labels['date_format'])),
+                              styles['date']))
     elements.append(Spacer(1, 20))
-    
-    # Get all categories and items
-    categories = Category.query.all()
-    
-    for category in categories:
-        # Get items for this category
-        items = MenuItem.query.filter_by(category_id=category.id, available=True).all()
-        
+
+    for section in menu_data['menu_sections']:
+        category = section['category']
+        items = section['menu_items']
+
         if items:
             # Category header
-            cat_name = f"{category.icon} {category.name}" if category.icon else category.name
-            cat_header = Paragraph(cat_name, category_style)
-            elements.append(cat_header)
-            
-            if category.description:
-                cat_desc = Paragraph(category.description, item_desc_style)
-                elements.append(cat_desc)
+            cat_name = f"{category['icon']} {category['name']}" if category['icon'] else category['name']
+            elements.append(Paragraph(cat_name, styles['category']))
+
+            if category['description']:
+                elements.append(Paragraph(category['description'], styles['item_desc']))
                 elements.append(Spacer(1, 10))
-            
-            # Create table for items
+
+            # Create table for items, with a photo column if any item has one
             table_data = []
-            
-            for item in items:
+            photos = [image_file(image_dir, item['image_url'], IMAGE_PDF_WIDTH) if image_dir else None
+                      for item in items]
+            with_photos = any(photos)
+            spans = []
+
+            for item, photo in zip(items, photos):
                 # Item name and price row
-                name_cell = Paragraph(item.name, item_name_style)
-                price_cell = Paragraph(f"₦{item.price:,.0f}", item_name_style)
-                
+                name_cell = Paragraph(item['name'], styles['item_name'])
+                price_cell = Paragraph(f"₦{item['price']:,.0f}", styles['item_name'])
+
                 # Build tags
                 tags = []
-                if item.is_spicy:
-                    tags.append("🌶️ Spicy")
-                if item.is_vegetarian:
-                    tags.append("🌱 Vegetarian")
-                if item.prep_time:
-                    tags.append(f"⏱️ {item.prep_time}")
-                
+                if item['is_spicy']:
+                    tags.append(f"🌶️ {labels['spicy']}")
+                if item['is_vegetarian']:
+                    tags.append(f"🌱 {labels['vegetarian']}")
+                if item['prep_time']:
+                    tags.append(f"⏱️ {item['prep_time']}")
+
                 tags_text = " • ".join(tags) if tags else ""
-                
+
                 # Description with tags
-                desc_text = item.description if item.description else ""
+                desc_text = item['description'] if item['description'] else ""
                 if tags_text:
                     desc_text += f"<br/><i>{tags_text}</i>"
-                
-                desc_cell = Paragraph(desc_text, item_desc_style)
-                
-                # Add rows
-                table_data.append([name_cell, price_cell])
-                table_data.append([desc_cell, ''])
-                table_data.append([Spacer(1, 8), ''])  # Add spacing between items
-            
+
+                desc_cell = Paragraph(desc_text, styles['item_desc'])
+
+                # Add rows; the photo sits beside the name and description
+                if with_photos:
+                    spans.append(('SPAN', (0, len(table_data)), (0, len(table_data) + 1)))
+                    photo_cell = Image(photo, width=1.1*inch, height=0.825*inch) if photo else ''
+                    table_data.append([photo_cell, name_cell, price_cell])
+                    table_data.append(['', desc_cell, ''])
+                    table_data.append([Spacer(1, 8), '', ''])  # Add spacing between items
+                else:
+                    table_data.append([name_cell, price_cell])
+                    table_data.append([desc_cell, ''])
+                    table_data.append([Spacer(1, 8), ''])  # Add spacing between items
+
             # Create and style the table
-            item_table = Table(table_data, colWidths=[4.5*inch, 1.5*inch])
+            col_widths = [1.3*inch, 3.2*inch, 1.5*inch] if with_photos else [4.5*inch, 1.5*inch]
+            item_table = Table(table_data, colWidths=col_widths)
             item_table.setStyle(TableStyle([
                 ('VALIGN', (0, 0), (-1, -1), 'TOP'),
                 ('LEFTPADDING', (0, 0), (-1, -1), 0),
                 ('RIGHTPADDING', (0, 0), (-1, -1), 0),
                 ('TOPPADDING', (0, 0), (-1, -1), 2),
                 ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ]))
-            
+            ] + spans))
+
             elements.append(item_table)
             elements.append(Spacer(1, 15))
-    
+
     # Add footer
     elements.append(Spacer(1, 30))
-    footer = Paragraph(
-        "Thank you for choosing Naija Flavours!<br/>For orders and inquiries, <a href='https://naija-flavours.onrender.com/'><b>visit us online</b></a>.",
-        ParagraphStyle('Footer', parent=styles['Normal'], 
-                      fontSize=9, textColor=colors.grey, 
-                      alignment=TA_CENTER, fontName='Helvetica-Oblique')
-    )
-    elements.append(footer)
-    
+    elements.append(Paragraph(labels['footer'], styles['footer']))
+
     # Build PDF
     doc.build(elements)
-    
-    # Move buffer position to beginning
-    buffer.seek(0)
-    
-    # Send the PDF
+    return buffer.getvalue()
+
+def load_renderers():
+    """Import ReportLab and qrcode (with PIL) up front and build the PDF styles"""
+    import qrcode.image.svg
+    import reportlab.platypus
+    get_pdf_styles()
+
+def build_poster_pdf(url, language=PDF_DEFAULT_LANGUAGE, paper='letter'):
+    """Render a one-page poster with a large QR code linking to url"""
+    from reportlab.graphics import renderPDF
+    from reportlab.graphics.barcode.qr import QrCodeWidget
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors, pagesizes
+    from reportlab.pdfgen import canvas
+
+    labels = PDF_LANGUAGES[language]
+    width, height = getattr(pagesizes, paper)
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(width, height))
+
+    pdf.setFillColor(colors.HexColor('#008751'))
+    pdf.setFont('Helvetica-Bold', 44)
+    pdf.drawCentredString(width / 2, height - 110, 'Naija Flavours')
+    pdf.setFillColor(colors.HexColor('#666666'))
+    pdf.setFont('Helvetica', 18)
+    pdf.drawCentredString(width / 2, height - 145, labels['subtitle'])
+
+    # Vector QR code, scaled to 60% of the page width
+    side = width * 0.6
+    qr = QrCodeWidget(url, barLevel='M')
+    x1, y1, x2, y2 = qr.getBounds()
+    drawing = Drawing(side, side, transform=[side / (x2 - x1), 0, 0, side / (y2 - y1), 0, 0])
+    drawing.add(qr)
+    renderPDF.draw(drawing, pdf, (width - side) / 2, (height - side) / 2 - 20)
+
+    pdf.setFillColor(colors.HexColor('#FF6B35'))
+    pdf.setFont('Helvetica-Bold', 28)
+    pdf.drawCentredString(width / 2, (height - side) / 2 - 70, labels['scan'])
+    pdf.setFillColor(colors.grey)
+    pdf.setFont('Helvetica', 12)
+    pdf.drawCentredString(width / 2, 60, url)
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+# Background jobs
+# Generation jobs run in a per-worker process pool so ReportLab never holds a
+# request thread. Each job is a row in the Job table: identical pending jobs
+# share a dedupe key (target plus menu version), and finished files are stored
+# under JOB_ARTIFACT_DIR by content hash, so every worker can serve the newest
+# one. Outcomes are recorded by a job-results thread in each process, never on
+# the pool's own thread. A pending job whose worker died, or that outlived
+# JOB_TIMEOUT, is treated as lost and queued again on the next request.
+JOB_KINDS = {'menu_pdf': 'application/pdf', 'poster': 'application/pdf', 'qr_sheet': 'application/pdf'}
+POSTER_PAPER_SIZES = ('letter', 'A4')
+# Longer targets (e.g. QR sheets for many tables) are stored as a hash
+JOB_TARGET_MAX_LENGTH = 200
+# Finished artifacts kept per target; older files are deleted
+JOB_KEEP_ARTIFACTS = 3
+JOB_POLL_INTERVAL = 0.2
+
+_job_pool = {'executor': None, 'pid': None}
+_job_pool_lock = threading.Lock()
+# Finished futures wait here for this process's job-results thread
+_job_results = {'queue': None, 'pid': None}
+_running_jobs = set()  # ids of jobs submitted by this process
+_artifact_cache = {}   # target -> newest artifact this worker has loaded
+
+def run_job(kind, params, data):
+    """Build a job's artifact and return (bytes, seconds); runs in a pool process, so it only gets plain data"""
+    started = time.perf_counter()
+    if kind == 'menu_pdf':
+        body = build_menu_pdf(data, params['language'])
+    elif kind == 'qr_sheet':
+        body = build_qr_sheet_pdf(data['codes'], params['language'], params['paper'])
+    else:
+        body = build_poster_pdf(params['url'], params['language'], params['paper'])
+    return body, time.perf_counter() - started
+
+def job_target(kind, params):
+    target = f"{kind}?{urlencode(sorted(params.items()))}" if params else kind
+    if len(target) > JOB_TARGET_MAX_LENGTH:
+        target = f"{kind}#{hashlib.sha256(target.encode()).hexdigest()}"
+    return target
+
+def get_job_pool():
+    """This process's pool, created on first use so the gunicorn master never owns one"""
+    with _job_pool_lock:
+        if _job_pool['executor'] is None or _job_pool['pid'] != os.getpid():
+            # Spawned rather than forked: forking a threaded worker could copy a held lock
+            _job_pool['executor'] = ProcessPoolExecutor(max_workers=current_app.config['JOB_WORKERS'],
+                                                        mp_context=multiprocessing.get_context('spawn'))
+            _job_pool['pid'] = os.getpid()
+        return _job_pool['executor']
+
+def _reset_job_pool():
+    with _job_pool_lock:
+        _job_pool['executor'] = None
+
+def submit_to_pool(fn, *args):
+    """Run fn in the pool, replacing the pool once if one of its processes has died"""
+    try:
+        return get_job_pool().submit(fn, *args)
+    except BrokenProcessPool:
+        _reset_job_pool()
+        return get_job_pool().submit(fn, *args)
+
+def _queue_job_result(app, job_id, future):
+    """Done-callback for pool futures: hand the outcome to the job-results thread.
+
+    Callbacks run on the executor's own management thread, which must not block
+    on database commits or file writes, so _finish_job() runs elsewhere.
+    """
+    with _job_pool_lock:
+        if _job_results['pid'] != os.getpid():
+            _job_results['queue'] = queue.SimpleQueue()
+            _job_results['pid'] = os.getpid()
+            threading.Thread(target=_finish_jobs, args=(_job_results['queue'],),
+                             name='job-results', daemon=True).start()
+        results = _job_results['queue']
+    results.put((app, job_id, future))
+
+def _finish_jobs(results):
+    while True:
+        _finish_job(*results.get())
+
+def _worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+def _job_is_lost(job):
+    """True for a pending job that has outlived JOB_TIMEOUT or whose worker process is gone"""
+    if datetime.utcnow() - job.created_at > timedelta(seconds=current_app.config['JOB_TIMEOUT']):
+        return True
+    host, _, pid = (job.worker or '').rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return job.id not in _running_jobs
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass
+    return False
+
+def enqueue_job(kind, params, menu_version=None, menu_data=None):
+    """Queue a job, or return the identical one that is already pending.
+
+    Menu PDFs are built one at a time per language: while one is pending it is
+    returned for newer versions too, and _finish_job() queues a single
+    follow-up if the menu moved on while it ran.
+    """
+    target = job_target(kind, params)
+    dedupe_key = hashlib.sha256(f'{target}#{menu_version}'.encode()).hexdigest()
+    job = Job.query.filter_by(dedupe_key=dedupe_key).first()
+    if job is None and kind == 'menu_pdf':
+        job = Job.query.filter_by(target=target, status='pending').order_by(Job.id.desc()).first()
+    if job is not None:
+        if not _job_is_lost(job):
+            return job
+        job.status = 'failed'
+        job.error = 'Lost: its worker stopped or it timed out'
+        job.dedupe_key = None
+        job.finished_at = datetime.utcnow()
+        db.session.flush()
+
+    job = Job(kind=kind, target=target, params=params, menu_version=menu_version,
+              dedupe_key=dedupe_key, worker=_worker_name())
+    db.session.add(job)
+    try:
+        db.session.flush()
+        # Claimed before the commit makes the job visible, so other threads never see it as lost
+        _running_jobs.add(job.id)
+        db.session.commit()
+    except IntegrityError:
+        # Another worker or thread queued the same job first
+        db.session.rollback()
+        return (Job.query.filter_by(dedupe_key=dedupe_key).first()
+                or Job.query.filter_by(target=target, menu_version=menu_version).order_by(Job.id.desc()).first())
+
+    app = current_app._get_current_object()
+    job_id = job.id
+    if kind == 'qr_sheet':
+        _start_qr_sheet(app, job_id, params)
+        return job
+    future = submit_to_pool(run_job, kind, params, menu_data)
+    future.add_done_callback(lambda future: _queue_job_result(app, job_id, future))
+    return job
+
+def store_artifact(body, extension):
+    """Write an artifact under its content hash and return the file name"""
+    directory = current_app.config['JOB_ARTIFACT_DIR']
+    os.makedirs(directory, exist_ok=True)
+    name = f'{hashlib.sha256(body).hexdigest()[:32]}.{extension}'
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        write_file_atomically(path, body)
+    return name
+
+def _finish_job(app, job_id, future):
+    """Record a job's outcome; runs on the job-results thread once the pool has run it"""
+    with app.app_context():
+        try:
+            job = db.session.get(Job, job_id)
+            try:
+                body, elapsed = future.result()
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    _reset_job_pool()
+                job.status = 'failed'
+                job.error = str(e) or e.__class__.__name__
+                if job.kind == 'menu_pdf':
+                    with _metrics_lock:
+                        _menu_pdf_stats['build_errors'] += 1
+            else:
+                job.artifact = store_artifact(body, 'pdf')
+                job.artifact_size = len(body)
+                job.duration = round(elapsed, 4)
+                job.status = 'done'
+                observe('job_seconds', elapsed, kind=job.kind)
+                if job.kind == 'menu_pdf':
+                    observe('pdf_build_seconds', elapsed)
+                    with _metrics_lock:
+                        _menu_pdf_stats['builds'] += 1
+                        _menu_pdf_stats['last_build_seconds'] = round(elapsed, 4)
+                        _menu_pdf_stats['total_build_seconds'] += elapsed
+            increment('jobs_total', kind=job.kind, status=job.status)
+            job.dedupe_key = None
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            if job.status == 'done':
+                prune_artifacts(job.target)
+                if job.kind == 'menu_pdf':
+                    save_last_known_good_pdf(job.params['language'], job.menu_version, body)
+            if job.kind == 'menu_pdf' and get_menu_version(max_age=0) != job.menu_version:
+                # Edits made while this build ran were folded into it; build their version now
+                enqueue_menu_pdf(job.params['language'])
+        except Exception:
+            record_swallowed_exception('finish_job')
+        finally:
+            _running_jobs.discard(job_id)
+
+def prune_artifacts(target):
+    """Forget all but the newest finished artifacts of a target, deleting files no other job uses"""
+    old = (Job.query.filter(Job.target == target, Job.artifact.isnot(None))
+           .order_by(Job.id.desc()).offset(JOB_KEEP_ARTIFACTS).all())
+    if not old:
+        return
+    names = {job.artifact for job in old}
+    for job in old:
+        job.artifact = None
+    db.session.commit()
+    in_use = set(db.session.scalars(db.select(Job.artifact).where(Job.artifact.in_(names))))
+    for name in names - in_use:
+        try:
+            os.remove(os.path.join(current_app.config['JOB_ARTIFACT_DIR'], name))
+        except FileNotFoundError:
+            pass
+
+def latest_artifact(target):
+    """The newest finished artifact of a target, read from disk once per worker"""
+    job = (Job.query.filter(Job.target == target, Job.artifact.isnot(None))
+           .order_by(Job.id.desc()).first())
+    entry = _artifact_cache.get(target)
+    if job is None or (entry is not None and entry['job_id'] == job.id):
+        return entry
+    try:
+        with open(os.path.join(current_app.config['JOB_ARTIFACT_DIR'], job.artifact), 'rb') as f:
+            body = f.read()
+    except FileNotFoundError:
+        # Pruned by another worker since the query; keep what we have
+        return entry
+    entry = _artifact_cache[target] = {
+        'job_id': job.id,
+        'version': job.menu_version,
+        'updated_at': job.finished_at,
+        'variants': encode_variants(body),
+    }
+    return entry
+
+def get_artifact(kind, params, menu_version=None, menu_data=None):
+    """Return (entry, job): the newest artifact available now, and the job building a newer one, if any.
+
+    The entry this worker already holds is served as long as it matches
+    menu_version; otherwise one query finds the newest finished artifact, and a
+    job is queued for menu_version if that is still older.
+    """
+    target = job_target(kind, params)
+    entry = _artifact_cache.get(target)
+    if entry is not None and entry['version'] == menu_version:
+        return entry, None
+    entry = latest_artifact(target)
+    if entry is not None and entry['version'] == menu_version:
+        return entry, None
+    return entry, enqueue_job(kind, params, menu_version, menu_data)
+
+def wait_for_job(job_id, timeout):
+    """Poll a job until it is no longer pending or timeout seconds have passed"""
+    deadline = time.monotonic() + timeout
+    while True:
+        # End the transaction so commits from other workers become visible
+        db.session.close()
+        job = db.session.get(Job, job_id)
+        if job.status != 'pending' or time.monotonic() >= deadline:
+            return job
+        time.sleep(JOB_POLL_INTERVAL)
+
+def artifact_response(entry, job, filename):
+    """Serve an artifact, or wait for the job building the first one (up to JOB_WAIT_TIMEOUT)"""
+    if entry is None:
+        job = wait_for_job(job.id, current_app.config['JOB_WAIT_TIMEOUT'])
+        if job.status == 'failed':
+            return jsonify({'error': 'Generation failed', 'job': job.to_dict()}), 500
+        entry = latest_artifact(job.target) if job.status == 'done' else None
+        if entry is None:
+            response = jsonify(job.to_dict())
+            response.status_code = 202
+            response.headers['Location'] = url_for('main.job_status', id=job.id)
+            response.headers['Retry-After'] = '2'
+            return response
+
+    response = cached_response(
+        entry['variants'],
+        JOB_KINDS[job.kind] if job is not None else 'application/pdf',
+        f"job-{entry['job_id']}-{entry['variants']['digest']}",
+        last_modified=entry['updated_at']
+    )
+    response.headers.set('Content-Disposition', 'attachment', filename=filename)
+    return response
+
+# Table QR sheets
+# One card per table, each QR code encoding the menu URL with the table label,
+# laid out on cut-out sheets. Codes are PNG files named by the hash of what they
+# encode, so regenerating a sheet after adding tables only encodes the new ones;
+# the missing codes are encoded in parallel across the job pool before the
+# layout itself runs as one more pool task.
+QR_SHEET_MAX_TABLES = 500
+QR_SHEET_GRID = (3, 4)  # columns, rows per page
+QR_SHEET_BOX_SIZE = 10
+QR_SHEET_BORDER = 2
+
+def parse_table_labels(value, prefix='Table'):
+    """Expand '1-120' ranges, numbers and free-form labels (comma- or line-separated, or a list) into table labels"""
+    parts = [str(part) for part in value] if isinstance(value, list) else re.split(r'[,\n]', value or '')
+    labels = []
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        numbers = re.fullmatch(r'(\d+)\s*-\s*(\d+)', part)
+        if numbers:
+            first, last = int(numbers.group(1)), int(numbers.group(2))
+            if last < first:
+                raise ApiError(f'Invalid table range: {part}')
+            labels.extend(f'{prefix} {number}' for number in range(first, min(last, first + QR_SHEET_MAX_TABLES) + 1))
+        elif part.isdigit():
+            labels.append(f'{prefix} {part}')
+        else:
+            labels.append(part[:40])
+        if len(labels) > QR_SHEET_MAX_TABLES:
+            raise ApiError(f'At most {QR_SHEET_MAX_TABLES} tables per sheet')
+    if not labels:
+        raise ApiError('tables is required, e.g. 1-120 or Patio 1, Patio 2')
+    return list(dict.fromkeys(labels))
+
+def table_url(base_url, label):
+    return f"{base_url}menu?{urlencode({'table': label})}"
+
+def qr_code_path(url):
+    """Where the cached PNG for a URL lives; the name is a hash of everything that affects the image"""
+    key = hashlib.sha256(f'{url}|M|{QR_SHEET_BOX_SIZE}|{QR_SHEET_BORDER}'.encode()).hexdigest()
+    return os.path.join(current_app.config['JOB_ARTIFACT_DIR'], 'qr-codes', f'{key[:32]}.png')
+
+def encode_qr_files(codes):
+    """Encode (url, path) pairs as PNG files and return the time each took; runs in a pool process"""
+    import qrcode
+
+    durations = []
+    for url, path in codes:
+        started = time.perf_counter()
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M,
+                           box_size=QR_SHEET_BOX_SIZE, border=QR_SHEET_BORDER)
+        qr.add_data(url)
+        qr.make(fit=True)
+        write_file_atomically(path, lambda f: qr.make_image(fill_color='black', back_color='white').save(f, 'PNG'))
+        durations.append(time.perf_counter() - started)
+    return durations
+
+def build_qr_sheet_pdf(codes, language=PDF_DEFAULT_LANGUAGE, paper='letter'):
+    """Lay out (label, PNG path) pairs as a grid of table cards with dashed cut lines"""
+    from reportlab.lib import colors, pagesizes
+    from reportlab.lib.units import inch
+    from reportlab.pdfgen import canvas
+
+    labels = PDF_LANGUAGES[language]
+    width, height = getattr(pagesizes, paper)
+    columns, rows = QR_SHEET_GRID
+    margin = 0.5 * inch
+    cell_width = (width - 2 * margin) / columns
+    cell_height = (height - 2 * margin) / rows
+    side = min(cell_width, cell_height) - 0.9 * inch
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(width, height))
+    pdf.setTitle('Naija Flavours table QR codes')
+    for index, (label, path) in enumerate(codes):
+        if index and index % (columns * rows) == 0:
+            pdf.showPage()
+        position = index % (columns * rows)
+        x = margin + (position % columns) * cell_width
+        y = height - margin - (position // columns + 1) * cell_height
+
+        pdf.setStrokeColor(colors.lightgrey)
+        pdf.setDash(3, 3)
+        pdf.rect(x, y, cell_width, cell_height)
+        pdf.setDash()
+        pdf.drawImage(path, x + (cell_width - side) / 2, y + 0.65 * inch, side, side)
+        pdf.setFillColor(colors.HexColor('#008751'))
+        pdf.setFont('Helvetica-Bold', 16)
+        pdf.drawCentredString(x + cell_width / 2, y + 0.4 * inch, label)
+        pdf.setFillColor(colors.grey)
+        pdf.setFont('Helvetica', 9)
+        pdf.drawCentredString(x + cell_width / 2, y + 0.2 * inch, labels['scan'])
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+def _start_qr_sheet(app, job_id, params):
+    """Encode the sheet's missing codes across the pool, then lay the sheet out as the job's final task"""
+
+    def run():
+        with app.app_context():
+            try:
+                codes = [(label, table_url(params['base_url'], label)) for label in params['tables']]
+                paths = {url: qr_code_path(url) for _, url in codes}
+                missing = [(url, path) for url, path in paths.items() if not os.path.exists(path)]
+                increment('qr_sheet_codes_total', len(paths) - len(missing), result='reused')
+                increment('qr_sheet_codes_total', len(missing), result='encoded')
+
+                pool = get_job_pool()
+                if missing:
+                    os.makedirs(os.path.dirname(missing[0][1]), exist_ok=True)
+                    # A few chunks per pool process keeps them all busy without a task per code
+                    chunks = current_app.config['JOB_WORKERS'] * 4
+                    for durations in pool.map(encode_qr_files, [missing[i::chunks] for i in range(chunks)]):
+                        for duration in durations:
+                            observe('qr_encode_seconds', duration, format='png')
+                future = pool.submit(run_job, 'qr_sheet', params,
+                                     {'codes': [(label, paths[url]) for label, url in codes]})
+            except Exception as e:
+                future = Future()
+                future.set_exception(e)
+            future.add_done_callback(lambda future: _queue_job_result(app, job_id, future))
+
+    threading.Thread(target=run, name=f'job-{job_id}', daemon=True).start()
+
+def enqueue_menu_pdf(language=PDF_DEFAULT_LANGUAGE):
+    snapshot = get_menu_snapshot()
+    return get_artifact('menu_pdf', {'language': language}, snapshot['version'],
+                        {'menu_sections': snapshot['data']['menu_sections'],
+                         'image_dir': current_app.config['IMAGE_DIR']})
+
+def _rebuild_menu_pdf_in_background():
+    """Queue the menu PDF (and re-export the site) after an edit.
+
+    Each worker runs one rebuild at a time; edits made while it runs only ask
+    for one more round, which picks up the newest menu.
+    """
+    app = current_app._get_current_object()
+    with _menu_pdf_rebuild_lock:
+        if _menu_pdf_rebuild['running']:
+            _menu_pdf_rebuild['again'] = True
+            return
+        _menu_pdf_rebuild['running'] = True
+
+    def run():
+        while True:
+            with _menu_pdf_rebuild_lock:
+                _menu_pdf_rebuild['again'] = False
+            with app.app_context():
+                try:
+                    enqueue_menu_pdf()
+                except Exception:
+                    record_swallowed_exception('menu_pdf_rebuild')
+                if app.config['STATIC_EXPORT_DIR']:
+                    try:
+                        export_static_site(app.config['STATIC_EXPORT_DIR'], app.config['STATIC_EXPORT_BASE_URL'])
+                    except Exception:
+                        record_swallowed_exception('static_export')
+            with _menu_pdf_rebuild_lock:
+                if not _menu_pdf_rebuild['again']:
+                    _menu_pdf_rebuild['running'] = False
+                    return
+
+    # The session that just committed can't run queries from its after_commit hook
+    threading.Thread(target=run, name='menu-pdf-rebuild', daemon=True).start()
+
+@db.event.listens_for(db.session, 'after_commit')
+def _rebuild_menu_pdf_after_commit(session):
+    if session.info.pop('menu_version_bumped', False):
+        _rebuild_menu_pdf_in_background()
+
+@db.event.listens_for(db.session, 'after_rollback')
+def _clear_menu_version_flag(session):
+    session.info.pop('menu_version_bumped', None)
+
+@main.route('/download-menu-pdf')
+def download_menu_pdf():
+    """Download the complete menu as a PDF (?lang=en or fr)"""
+    language = request.args.get('lang', PDF_DEFAULT_LANGUAGE)
+    if language not in PDF_LANGUAGES:
+        return jsonify({'error': f"lang must be one of: {', '.join(PDF_LANGUAGES)}"}), 400
+    suffix = '' if language == PDF_DEFAULT_LANGUAGE else f'-{language}'
+    try:
+        get_menu_snapshot()
+        if g.get('menu_stale'):
+            return last_known_good_pdf_response(language, f'naija-flavors-menu{suffix}.pdf')
+        entry, job = enqueue_menu_pdf(language)
+    except DatabaseUnavailable:
+        return last_known_good_pdf_response(language, f'naija-flavors-menu{suffix}.pdf')
+    except DB_UNAVAILABLE_ERRORS:
+        db.session.rollback()
+        record_db_failure()
+        return last_known_good_pdf_response(language, f'naija-flavors-menu{suffix}.pdf')
+
+    result = 'miss' if entry is None else 'stale' if job is not None else 'hit'
+    with _metrics_lock:
+        _menu_pdf_stats[{'hit': 'hits', 'stale': 'stale_hits', 'miss': 'misses'}[result]] += 1
+    increment('menu_pdf_requests_total', result=result)
+
+    return artifact_response(entry, job, f'naija-flavors-menu{suffix}.pdf')
+
+@main.route('/menu-pdf/stats')
+def menu_pdf_stats():
+    """Build time and cache hit rate of the menu PDF cache"""
+    with _metrics_lock:
+        stats = dict(_menu_pdf_stats)
+    requests_served = stats['hits'] + stats['stale_hits'] + stats['misses']
+    stats['hit_rate'] = round((stats['hits'] + stats['stale_hits']) / requests_served, 4) if requests_served else None
+    stats['avg_build_seconds'] = round(stats['total_build_seconds'] / stats['builds'], 4) if stats['builds'] else None
+    stats['total_build_seconds'] = round(stats['total_build_seconds'], 4)
+    entry = _artifact_cache.get(job_target('menu_pdf', {'language': PDF_DEFAULT_LANGUAGE}))
+    stats['cached_version'] = entry['version'] if entry else None
+    return jsonify(stats)
+
+@main.route('/jobs', methods=['POST'])
+def create_job():
+    """Queue a print-asset job.
+
+    kind is menu_pdf, poster or qr_sheet, language en or fr, and paper letter
+    or A4 (posters and QR sheets). QR sheets also take tables, e.g. '1-120' or
+    'Patio 1, Patio 2'. An asset that is already up to date returns the job
+    that built it. JSON clients get the job back; the admin form is redirected.
+    """
+    values = request.get_json(silent=True) or request.form
+    kind = values.get('kind')
+    language = values.get('language', PDF_DEFAULT_LANGUAGE)
+    paper = values.get('paper', 'letter')
+    if kind not in JOB_KINDS or language not in PDF_LANGUAGES or paper not in POSTER_PAPER_SIZES:
+        raise ApiError(f"kind must be one of {', '.join(JOB_KINDS)}, language one of {', '.join(PDF_LANGUAGES)} "
+                       f"and paper one of {', '.join(POSTER_PAPER_SIZES)}")
+
+    if kind == 'menu_pdf':
+        entry, job = enqueue_menu_pdf(language)
+    elif kind == 'qr_sheet':
+        params = {'language': language, 'paper': paper, 'base_url': request.host_url,
+                  'tables': parse_table_labels(values.get('tables'))}
+        entry, job = get_artifact(kind, params)
+    else:
+        params = {'language': language, 'paper': paper, 'url': request.host_url + 'menu'}
+        entry, job = get_artifact(kind, params)
+    if job is None:
+        job = db.session.get(Job, entry['job_id'])
+
+    if wants_json_response():
+        response = jsonify(job.to_dict())
+        response.status_code = 202 if job.status == 'pending' else 200
+        response.headers['Location'] = url_for('main.job_status', id=job.id)
+        return response
+    flash(f"Job #{job.id} ({job.target}) is {job.status}; download it from "
+          f"{url_for('main.job_result', id=job.id)} once done.", 'success')
+    return redirect(url_for('main.admin'))
+
+@main.route('/jobs/<int:id>')
+def job_status(id):
+    """Status of a job, with result_url once its artifact is ready"""
+    return jsonify(db.get_or_404(Job, id).to_dict())
+
+@main.route('/jobs/<int:id>/result')
+def job_result(id):
+    """A finished job's artifact; files are named by content hash, so they are cached as immutable"""
+    job = db.get_or_404(Job, id)
+    if job.artifact is None:
+        return jsonify({'error': f'Job is {job.status} and has no result', 'job': job.to_dict()}), 404
     return send_file(
-        buffer,
+        os.path.join(current_app.config['JOB_ARTIFACT_DIR'], job.artifact),
+        mimetype=JOB_KINDS[job.kind],
         as_attachment=True,
-        download_name='naija-flavors-menu.pdf',
-        mimetype='application/pdf'
+        download_name=f'naija-flavors-{job.kind.replace("_", "-")}-{job.id}.pdf',
+        etag=job.artifact,
+        max_age=365 * 24 * 3600,
     )
 
 
 
+# Static export
+# The public pages, PDFs and QR codes only depend on the menu, so they can be
+# rendered to a directory and served by any static server or CDN, leaving Python
+# for /admin. Every file is named by the hash of its content and written once,
+# next to .gz and .br copies where compression helps. The pages are also written
+# under their route (index.html, menu/index.html, qr/index.html) with their
+# links pointing at the fingerprinted files, so a plain file server works too.
+# manifest.json maps each route to its file and is replaced atomically, so
+# readers always see a complete export. With STATIC_EXPORT_DIR set, each worker
+# re-exports after its own menu changes, once the new menu PDF is built.
+STATIC_EXPORT_MANIFEST = 'manifest.json'
+# (route, file name before fingerprinting, whether to write compressed copies)
+STATIC_EXPORT_ROUTES = [
+    ('/', 'index.html', True),
+    ('/menu', 'menu.html', True),
+    ('/qr', 'qr.html', True),
+    ('/qr-pdf', 'naija-flavors-menu.pdf', False),
+    ('/download-menu-pdf', 'naija-flavors-menu.pdf', False),
+] + [
+    (f'/download-menu-pdf?lang={language}', f'naija-flavors-menu-{language}.pdf', False)
+    for language in PDF_LANGUAGES if language != PDF_DEFAULT_LANGUAGE
+]
+# Printed QR codes must keep working after the menu (and so its fingerprinted
+# file) changes, so the exported codes point at the PDF under this stable name
+STATIC_EXPORT_MENU_PDF = 'naija-flavors-menu.pdf'
+# (route, format) of the QR codes, drawn for the export rather than fetched
+STATIC_EXPORT_QR_CODES = [('/qr-code', 'png'), ('/qr-code?format=svg', 'svg')]
+# Internal links in exported pages: a root-relative path up to its query or fragment
+STATIC_EXPORT_LINK_PATTERN = re.compile(r'(?<=")/[^"#]*(?=["#])')
+_static_export_lock = threading.Lock()
+
+@contextmanager
+def static_export_lock(output_dir):
+    """One export at a time per directory: a thread lock, plus a file lock between processes where available"""
+    with _static_export_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(output_dir, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+def export_file(output_dir, name, body, content_type, compress):
+    """Write body as files/<stem>.<hash><ext> with its compressed copies and return its manifest entry"""
+    variants = encode_variants(body, compress)
+    stem, extension = os.path.splitext(name)
+    path = f"files/{stem}.{variants['digest']}{extension}"
+    encodings = {'gzip': '.gz', 'br': '.br'}
+    if not os.path.exists(os.path.join(output_dir, path)):
+        for encoding, suffix in encodings.items():
+            if encoding in variants:
+                write_file_atomically(os.path.join(output_dir, path + suffix), variants[encoding])
+        write_file_atomically(os.path.join(output_dir, path), body)
+    return {
+        'file': path,
+        'content_type': content_type,
+        'size': len(body),
+        'encodings': {encoding: path + suffix for encoding, suffix in encodings.items() if encoding in variants},
+    }
+
+def _read_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, STATIC_EXPORT_MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def export_static_site(output_dir, base_url):
+    """Render the public routes into output_dir and switch its manifest over to them; returns the manifest.
+
+    base_url is the public address of the site (e.g. https://naija-flavours.onrender.com/),
+    which the QR codes encode.
+    """
+    if not base_url:
+        raise ValueError('A base URL is needed for the QR codes, e.g. https://example.com/')
+    base_url = base_url.rstrip('/') + '/'
+    started = time.perf_counter()
+    os.makedirs(os.path.join(output_dir, 'files'), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, 'images'), exist_ok=True)
+
+    with static_export_lock(output_dir):
+        snapshot = get_menu_snapshot()
+        previous = _read_manifest(output_dir)
+        if previous is not None and previous['version'] > snapshot['version']:
+            # Another worker has already exported a newer menu
+            return previous
+
+        # Wait for this version's PDFs, so they match the pages; a build still
+        # running for an older version is waited for, then its follow-up
+        deadline = time.monotonic() + current_app.config['JOB_WAIT_TIMEOUT']
+        for language in PDF_LANGUAGES:
+            while time.monotonic() < deadline:
+                _, job = enqueue_menu_pdf(language)
+                if job is None or wait_for_job(job.id, deadline - time.monotonic()).status == 'failed':
+                    break
+
+        client = current_app.test_client()
+        routes = {}
+        pages = {}
+        for route, name, compress in STATIC_EXPORT_ROUTES:
+            response = client.get(route, base_url=base_url, headers={'Accept-Encoding': 'identity'})
+            if response.status_code != 200:
+                raise RuntimeError(f'{route} returned {response.status_code}')
+            if response.mimetype == 'text/html':
+                # Pages are written last, once the files they link to have their names
+                pages[route] = (name, response.get_data(as_text=True), response.content_type, compress)
+            else:
+                routes[route] = export_file(output_dir, name, response.get_data(), response.content_type, compress)
+            if route == '/qr-pdf':
+                write_file_atomically(os.path.join(output_dir, STATIC_EXPORT_MENU_PDF), response.get_data())
+                routes[route]['entry'] = STATIC_EXPORT_MENU_PDF
+        for route, fmt in STATIC_EXPORT_QR_CODES:
+            variants, mimetype = render_qr(base_url + STATIC_EXPORT_MENU_PDF, fmt=fmt)
+            routes[route] = export_file(output_dir, f'qr-code.{fmt}', variants['identity'], mimetype, fmt == 'svg')
+
+        # Item photos are already named by their content, so they are copied as they are
+        for item in snapshot['data']['menu_items']:
+            for width in IMAGE_WIDTHS:
+                for format in IMAGE_FORMATS:
+                    route = image_src(item['image_url'], width, format)
+                    source = image_file(current_app.config['IMAGE_DIR'], item['image_url'], width, format)
+                    if source is None:
+                        continue
+                    path = f'images/{os.path.basename(source)}'
+                    if not os.path.exists(os.path.join(output_dir, path)):
+                        with open(source, 'rb') as f:
+                            write_file_atomically(os.path.join(output_dir, path), f.read())
+                    routes[route] = {'file': path, 'content_type': f'image/{format}',
+                                     'size': os.path.getsize(source), 'encodings': {}}
+
+        # Links between pages go to their route directories, links to anything
+        # else to its stable or fingerprinted file; the rest (e.g. /admin) are left alone
+        prefix = urlsplit(base_url).path
+        entries = {route: route.strip('/') + '/index.html' if route != '/' else 'index.html' for route in pages}
+        links = {route: prefix + entry.get('entry', entry['file']) for route, entry in routes.items()}
+        links.update({route: prefix + entry[:-len('index.html')] for route, entry in entries.items()})
+        for route, (name, html, content_type, compress) in pages.items():
+            body = STATIC_EXPORT_LINK_PATTERN.sub(lambda link: links.get(link.group(), link.group()), html).encode()
+            routes[route] = dict(export_file(output_dir, name, body, content_type, compress), entry=entries[route])
+            os.makedirs(os.path.dirname(os.path.join(output_dir, entries[route])), exist_ok=True)
+            write_file_atomically(os.path.join(output_dir, entries[route]), body)
+
+        manifest = {
+            'version': snapshot['version'],
+            'generated_at': datetime.utcnow().isoformat(),
+            'base_url': base_url,
+            'routes': routes,
+        }
+        write_file_atomically(os.path.join(output_dir, STATIC_EXPORT_MANIFEST),
+                              json.dumps(manifest, indent=2, sort_keys=True).encode())
+        prune_static_export(output_dir, [manifest, previous])
+
+    observe('static_export_seconds', time.perf_counter() - started)
+    return manifest
+
+def prune_static_export(output_dir, manifests):
+    """Delete exported files that neither the new nor the previous manifest refers to"""
+    keep = set()
+    for manifest in manifests:
+        for entry in (manifest or {}).get('routes', {}).values():
+            keep.add(entry['file'])
+            keep.update(entry['encodings'].values())
+    for directory in ('files', 'images'):
+        for name in os.listdir(os.path.join(output_dir, directory)):
+            if f'{directory}/{name}' not in keep:
+                os.remove(os.path.join(output_dir, directory, name))
+
+@main.cli.command('export-static')
+@click.option('--output', default=None, help='Directory to export to (default: STATIC_EXPORT_DIR or instance/static)')
+@click.option('--base-url', default=None, help='Public URL of the site (default: STATIC_EXPORT_BASE_URL)')
+def export_static_command(output, base_url):
+    """Render the public pages, PDFs and QR codes to static files with a manifest"""
+    output = output or current_app.config['STATIC_EXPORT_DIR'] or os.path.join(current_app.instance_path, 'static')
+    manifest = export_static_site(output, base_url or current_app.config['STATIC_EXPORT_BASE_URL'])
+    print(f"✅ Exported menu version {manifest['version']}: {len(manifest['routes'])} routes to {output}")
+
+@main.route('/admin/export-static', methods=['POST'])
+def export_static():
+    """Export the public site now, in the background, to STATIC_EXPORT_DIR (or instance/static)"""
+    app = current_app._get_current_object()
+    output = app.config['STATIC_EXPORT_DIR'] or os.path.join(app.instance_path, 'static')
+    # The site's own address is the best guess for the QR codes when none is configured
+    base_url = app.config['STATIC_EXPORT_BASE_URL'] or request.host_url
+
+    def run():
+        with app.app_context():
+            try:
+                export_static_site(output, base_url)
+            except Exception:
+                record_swallowed_exception('static_export')
+
+    threading.Thread(target=run, name='static-export', daemon=True).start()
+    if wants_json_response():
+        return jsonify({'status': 'started', 'output': output,
+                        'manifest': os.path.join(output, STATIC_EXPORT_MANIFEST)}), 202
+    flash(f'Static export started; {os.path.join(output, STATIC_EXPORT_MANIFEST)} is updated when it is done.',
+          'success')
+    return redirect(url_for('main.admin'))
+
+# Health checks
+# /health/live only shows the process can answer, so restarts are never caused by
+# the database. /health/ready checks the database at most every HEALTH_CHECK_TTL
+# seconds per worker, and reports the connection pool. A worker counts as ready
+# while it can serve the menu, which includes serving the last known good copy
+# during a database outage.
+_health_check = {'result': None, 'checked_at': 0.0}
+_health_check_lock = threading.Lock()
+
+def check_database():
+    """Cached result of a trivial query: {'database': 'connected' or 'unreachable', 'error': ..., 'categories': n}"""
+    with _health_check_lock:
+        now = time.monotonic()
+        if (_health_check['result'] is not None
+                and now - _health_check['checked_at'] < current_app.config['HEALTH_CHECK_TTL']):
+            return _health_check['result']
+        if db_breaker_is_open():
+            result = {'database': 'unreachable', 'error': 'Circuit breaker open', 'categories': None}
+        else:
+            try:
+                # Counting categories costs no more than SELECT 1, and /health has always reported it
+                categories = db.session.execute(db.select(db.func.count(Category.id))).scalar()
+                db.session.rollback()
+                result = {'database': 'connected', 'error': None, 'categories': categories}
+            except Exception as e:
+                db.session.rollback()
+                result = {'database': 'unreachable', 'error': str(e), 'categories': None}
+        _health_check.update({'result': result, 'checked_at': now})
+        return result
+
+def pool_stats():
+    """Connection counts of this worker's pool (whichever of them the pool class reports)"""
+    pool = db.engine.pool
+    stats = {'class': type(pool).__name__}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    if 'overflow' in stats:
+        stats['max_overflow'] = current_app.config['DB_MAX_OVERFLOW']
+    return stats
+
+@main.route('/health/live')
+def health_live():
+    """Liveness probe; never touches the database"""
+    return jsonify({'status': 'alive', 'app': 'naija-flavors'})
+
+@main.route('/health/ready')
+def health_ready():
+    """Readiness probe: database status (cached), pool usage and whether the menu can be served"""
+    result = dict(check_database())
+    result['pool'] = pool_stats()
+    result['breaker'] = 'open' if db_breaker_is_open() else 'closed'
+    result['app'] = 'naija-flavors'
+    if result['database'] == 'connected':
+        result['status'] = 'ready'
+        return jsonify(result)
+    if _menu_cache['snapshot'] is not None or load_last_known_good() is not None:
+        result['status'] = 'degraded'
+        return jsonify(result)
+    result['status'] = 'unavailable'
+    return jsonify(result), 503
+
 # Add a health check endpoint
-@app.route('/health')
+@main.route('/health')
 def health():
-    try:
-        category_count = Category.query.count()
+    """Combined check kept for existing monitors; use /health/live and /health/ready for probes"""
+    result = check_database()
+    if result['database'] == 'connected':
         return jsonify({
             'status': 'healthy',
             'database': 'connected',
-            'categories': category_count,
+            'categories': result['categories'],
             'app': 'naija-flavors'
         })
-    except Exception as e:
-        return jsonify({
-            'status': 'unhealthy',
-            'database': 'disconnected',
-            'error': str(e),
-            'app': 'naija-flavors'
-        }), 500
+    return jsonify({
+        'status': 'unhealthy',
+        'database': 'disconnected',
+        'error': result['error'],
+        'app': 'naija-flavors'
+    }), 500
 
-@app.route('/init-db')
+@main.route('/init-db')
 def init_db_route():
     """Manually initialize database"""
     init_db()
     return "Database initialization attempted. Check logs."
 
+app = create_app()
+
 if __name__ == '__main__':
+    # Local development: set up the database, then serve
+    with app.app_context():
+        init_db()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,414 @@
+"""Load and micro-benchmarks for Naija Flavors.
+
+Seeds a throwaway SQLite database per catalogue size, then measures the public
+and admin pages through the Flask test client, optionally under a local
+multi-worker gunicorn, and times the PDF builder and template rendering on
+their own. Results are written as JSON so runs can be compared:
+
+    python benchmark.py                                  # every catalogue, test client + micro
+    python benchmark.py --catalogues sample,10k --gunicorn --workers 4
+    python benchmark.py --output new.json --compare baseline.json --max-regression 20
+
+The exit status is 1 when --compare finds a regression beyond the threshold.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from flask import render_template
+
+from app import (create_app, db, init_db, clear_menu_caches, load_menu_view, encode_variants,
+                 build_menu_pdf, Category, MenuItem, MenuVersion)
+
+# name -> (items, categories); None means the 30-item init_db() sample menu
+CATALOGUES = {
+    'sample': None,
+    '1k': (1000, 20),
+    '10k': (10000, 100),
+    '50k': (50000, 400),
+}
+ENDPOINTS = ['/', '/menu', '/admin', '/download-menu-pdf', '/qr-code', '/health']
+# Phones scanning the QR code all accept compressed responses
+REQUEST_HEADERS = {'Accept-Encoding': 'gzip, br'}
+SEED_BATCH_SIZE = 5000
+# Directories kept under the workdir, one set per catalogue, for the test client and gunicorn alike
+WORKDIR_SETTINGS = (('LAST_KNOWN_GOOD_DIR', 'last-known-good'), ('JOB_ARTIFACT_DIR', 'jobs'), ('IMAGE_DIR', 'images'))
+# Latency stats compared by --compare, per kind of result
+COMPARED_STATS = {'client': 'p50_ms', 'gunicorn': 'p50_ms', 'micro': 'p50_ms'}
+
+DISHES = ['Jollof Rice', 'Egusi Soup', 'Suya', 'Pounded Yam', 'Moi Moi', 'Akara', 'Pepper Soup',
+          'Ofada Stew', 'Fried Plantain', 'Asun', 'Efo Riro', 'Chapman', 'Zobo', 'Puff Puff',
+          'Banga Soup', 'Gizdodo', 'Nkwobi', 'Abacha', 'Kilishi', 'Boli']
+STYLES = ['Lagos', 'Abuja', 'Delta', 'Calabar', 'Kano', 'Enugu', 'Ibadan', 'Party', 'Smoky', 'Village']
+ICONS = ['🍲', '🍚', '🍖', '🥘', '🍢', '🥤']
+DESCRIPTION_WORDS = ['spicy', 'smoky', 'slow-cooked', 'fresh', 'grilled', 'peppered', 'palm oil',
+                     'assorted meat', 'stockfish', 'crayfish', 'locust beans', 'plantain', 'onions',
+                     'served with', 'a house favourite', 'made to order', 'with coleslaw']
+
+# Seeding
+def seed_synthetic(items, categories, seed):
+    """Fill an empty database with a deterministic synthetic catalogue"""
+    rng = random.Random(seed)
+    db.create_all()
+    db.session.execute(db.insert(Category), [{
+        'name': f'{STYLES[i % len(STYLES)]} Specials {i + 1}',
+        'description': f'Synthetic category {i + 1} for benchmarking',
+        'icon': ICONS[i % len(ICONS)],
+    } for i in range(categories)])
+
+    rows = []
+    for i in range(items):
+        rows.append({
+            'name': f'{rng.choice(STYLES)} {rng.choice(DISHES)} {i + 1}',
+            'description': ' '.join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(6, 14))).capitalize() + '.',
+            'price': rng.randrange(300, 12000, 50),
+            'category_id': rng.randint(1, categories),
+            'available': rng.random() > 0.1,
+            'is_spicy': rng.random() > 0.6,
+            'is_vegetarian': rng.random() > 0.7,
+            'prep_time': f'{rng.choice((5, 10, 15, 20, 25, 30))} min',
+        })
+        if len(rows) == SEED_BATCH_SIZE:
+            db.session.execute(db.insert(MenuItem), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(MenuItem), rows)
+
+    # Set the version directly: bump_menu_version() would start a PDF rebuild in the background
+    db.session.add(MenuVersion(id=1, version=1))
+    db.session.commit()
+
+def create_catalogue(name, workdir, seed):
+    """Create and seed the database for a catalogue and return (app, database path, seed seconds)"""
+    path = os.path.join(workdir, f'bench-{name}.db')
+    if os.path.exists(path):
+        os.remove(path)
+    directories = {setting: os.path.join(workdir, f'bench-{name}-{suffix}') for setting, suffix in WORKDIR_SETTINGS}
+    for directory in directories.values():
+        shutil.rmtree(directory, ignore_errors=True)
+    app = create_app(dict(directories, SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}'))
+
+    started = time.perf_counter()
+    with app.app_context():
+        if CATALOGUES[name] is None:
+            init_db()
+        else:
+            seed_synthetic(*CATALOGUES[name], seed=seed)
+    elapsed = time.perf_counter() - started
+
+    # Don't let a rebuild started by init_db() land in the next measurement
+    for thread in threading.enumerate():
+        if thread.name == 'menu-pdf-rebuild':
+            thread.join()
+    clear_menu_caches()
+    return app, path, elapsed
+
+# Measurement
+def summarize(latencies, elapsed=None, errors=0):
+    """Turn a list of latencies (seconds) into count, throughput and percentiles in milliseconds"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def percentile(p):
+        # Nearest-rank percentile
+        return round(ordered[max(0, -(-count * p // 100) - 1)] * 1000, 3) if count else None
+
+    stats = {
+        'count': count,
+        'errors': errors,
+        'mean_ms': round(sum(ordered) / count * 1000, 3) if count else None,
+        'p50_ms': percentile(50),
+        'p90_ms': percentile(90),
+        'p99_ms': percentile(99),
+        'max_ms': round(ordered[-1] * 1000, 3) if count else None,
+    }
+    if elapsed is not None:
+        stats['throughput_rps'] = round(count / elapsed, 2) if elapsed else None
+    return stats
+
+def bench_test_client(app, requests, duration):
+    """Time each endpoint through the Flask test client, in-process and single-threaded"""
+    client = app.test_client()
+    results = {}
+    for endpoint in ENDPOINTS:
+        # The first request fills the snapshot, page and PDF caches
+        started = time.perf_counter()
+        response = client.get(endpoint, headers=REQUEST_HEADERS)
+        cold = time.perf_counter() - started
+
+        latencies = []
+        errors = 0
+        began = time.perf_counter()
+        while len(latencies) < requests and time.perf_counter() - began < duration:
+            started = time.perf_counter()
+            status = client.get(endpoint, headers=REQUEST_HEADERS).status_code
+            latencies.append(time.perf_counter() - started)
+            errors += status >= 400
+        results[endpoint] = summarize(latencies, time.perf_counter() - began, errors)
+        results[endpoint].update(status=response.status_code, cold_ms=round(cold * 1000, 3),
+                                 bytes=len(response.get_data()))
+    return results
+
+def bench_micro(app, repeat, pdf_repeat):
+    """Time the snapshot query, template rendering, compression and the PDF builder on their own"""
+    results = {}
+
+    def timed(name, func, times):
+        latencies = []
+        for _ in range(times):
+            started = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - started)
+        results[name] = summarize(latencies)
+
+    with app.app_context():
+        timed('load_menu_view', load_menu_view, repeat)
+        data = load_menu_view()
+        data['change_seq'] = 0
+        with app.test_request_context('/menu'):
+            timed('render_index_html', lambda: render_template('index.html', **data), repeat)
+            timed('render_menu_html', lambda: render_template('menu.html', **data), repeat)
+            html = render_template('menu.html', **data).encode('utf-8')
+        timed('encode_menu_html', lambda: encode_variants(html), repeat)
+        results['encode_menu_html']['bytes'] = len(html)
+        timed('build_menu_pdf', lambda: build_menu_pdf(data), pdf_repeat)
+    return results
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def http_get(conn, endpoint):
+    conn.request('GET', endpoint, headers=REQUEST_HEADERS)
+    response = conn.getresponse()
+    body = response.read()
+    return response.status, body
+
+def bench_gunicorn(app, path, workers, threads, concurrency, duration):
+    """Serve the catalogue with gunicorn on a free local port and load each endpoint with concurrent clients"""
+    if shutil.which('gunicorn') is None and not _module_available('gunicorn'):
+        print("⚠️ gunicorn is not installed, skipping the gunicorn benchmark")
+        return None
+
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}',
+               **{setting: app.config[setting] for setting, _ in WORKDIR_SETTINGS})
+    here = os.path.dirname(os.path.abspath(__file__))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(here, 'gunicorn.conf.py'),
+         '--workers', str(workers), '--threads', str(threads), '--bind', f'127.0.0.1:{port}',
+         '--log-level', 'warning', 'app:app'],
+        cwd=here, env=env,
+    )
+    try:
+        wait_for_server(port, server)
+        results = {}
+        for endpoint in ENDPOINTS:
+            # Warm every worker's caches before measuring
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+            started = time.perf_counter()
+            status, body = http_get(conn, endpoint)
+            cold = time.perf_counter() - started
+            for _ in range(workers * 2):
+                http_get(conn, endpoint)
+            conn.close()
+
+            results[endpoint] = load_endpoint(port, endpoint, concurrency, duration)
+            results[endpoint].update(status=status, cold_ms=round(cold * 1000, 3), bytes=len(body))
+        return {'workers': workers, 'threads': threads, 'concurrency': concurrency, 'endpoints': results}
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def _module_available(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+def wait_for_server(port, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with status {server.returncode}')
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            if http_get(conn, '/health')[0] == 200:
+                conn.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError('gunicorn did not become healthy in time')
+
+def load_endpoint(port, endpoint, concurrency, duration):
+    """Hit one endpoint from concurrent keep-alive clients for duration seconds"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+        mine = []
+        failed = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status = http_get(conn, endpoint)[0]
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+                failed += 1
+                continue
+            mine.append(time.perf_counter() - started)
+            failed += status >= 400
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    began = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - began, errors[0])
+
+# Reporting
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_table(title, results):
+    print(f"\n{title}")
+    print(f"  {'':<22}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'cold ms':>10}")
+    for name, stats in results.items():
+        rps = stats.get('throughput_rps')
+        cold = stats.get('cold_ms')
+        print(f"  {name:<22}{stats['p50_ms'] or 0:>10.2f}{stats['p99_ms'] or 0:>10.2f}"
+              f"{'' if rps is None else f'{rps:.1f}':>10}{'' if cold is None else f'{cold:.1f}':>10}")
+
+def compare(current, baseline, max_regression, min_delta_ms):
+    """Return a line for every stat that got more than max_regression percent (and min_delta_ms) slower than the baseline"""
+    regressions = []
+    for name, catalogue in current['catalogues'].items():
+        previous = baseline.get('catalogues', {}).get(name)
+        if not previous:
+            continue
+        for kind, stat in COMPARED_STATS.items():
+            now, before = catalogue.get(kind), previous.get(kind)
+            if kind == 'gunicorn':
+                now = now and now['endpoints']
+                before = before and before['endpoints']
+            if not now or not before:
+                continue
+            for target, stats in now.items():
+                old = before.get(target, {}).get(stat)
+                new = stats.get(stat)
+                if old and new and new - old > min_delta_ms and (new - old) / old * 100 > max_regression:
+                    regressions.append(f"{name} {kind} {target}: {stat} {old:.2f} -> {new:.2f} "
+                                       f"(+{(new - old) / old * 100:.0f}%)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--catalogues', default=','.join(CATALOGUES),
+                        help=f"comma-separated catalogue sizes ({', '.join(CATALOGUES)})")
+    parser.add_argument('--requests', type=int, default=200, help='test-client requests per endpoint')
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='seconds per endpoint (test-client time limit, gunicorn load duration)')
+    parser.add_argument('--repeat', type=int, default=20, help='runs per micro-benchmark')
+    parser.add_argument('--pdf-repeat', type=int, default=3, help='runs of the PDF builder micro-benchmark')
+    parser.add_argument('--gunicorn', action='store_true', help='also benchmark a local multi-worker gunicorn')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads per worker')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent clients against gunicorn')
+    parser.add_argument('--no-client', action='store_true', help='skip the test-client benchmark')
+    parser.add_argument('--no-micro', action='store_true', help='skip the micro-benchmarks')
+    parser.add_argument('--seed', type=int, default=2026, help='random seed for synthetic catalogues')
+    parser.add_argument('--workdir', default=None, help='where to create the benchmark databases')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results file')
+    parser.add_argument('--compare', default=None, help='baseline JSON results to compare against')
+    parser.add_argument('--max-regression', type=float, default=25.0,
+                        help='percent slowdown against the baseline that counts as a regression')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='ignore slowdowns smaller than this, which are mostly noise')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.catalogues.split(',') if name.strip()]
+    unknown = [name for name in names if name not in CATALOGUES]
+    if unknown:
+        parser.error(f"unknown catalogue(s): {', '.join(unknown)}")
+    workdir = args.workdir or tempfile.mkdtemp(prefix='naija-bench-')
+
+    results = {
+        'meta': {
+            'started_at': datetime.utcnow().isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'settings': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        },
+        'catalogues': {},
+    }
+
+    for name in names:
+        print(f"🧪 Seeding catalogue '{name}'...")
+        app, path, seed_seconds = create_catalogue(name, workdir, args.seed)
+        with app.app_context():
+            counts = {
+                'categories': db.session.query(Category).count(),
+                'items': db.session.query(MenuItem).count(),
+            }
+        catalogue = results['catalogues'][name] = dict(counts, seed_seconds=round(seed_seconds, 3))
+        print(f"✅ {counts['items']} items in {counts['categories']} categories ({seed_seconds:.2f}s)")
+
+        if not args.no_client:
+            catalogue['client'] = bench_test_client(app, args.requests, args.duration)
+            print_table(f"Test client — {name}", catalogue['client'])
+        if not args.no_micro:
+            catalogue['micro'] = bench_micro(app, args.repeat, args.pdf_repeat)
+            print_table(f"Micro-benchmarks — {name}", catalogue['micro'])
+        if args.gunicorn:
+            catalogue['gunicorn'] = bench_gunicorn(app, path, args.workers, args.threads,
+                                                   args.concurrency, args.duration)
+            if catalogue['gunicorn']:
+                print_table(f"gunicorn {args.workers}x{args.threads} — {name}", catalogue['gunicorn']['endpoints'])
+        clear_menu_caches()
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📝 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression, args.min_delta_ms)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) over {args.max_regression:.0f}%:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"✅ No regressions over {args.max_regression:.0f}% against {args.compare}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,21 @@
+# Gunicorn settings, picked up automatically by `gunicorn app:app`
+import os
+
+# Load the app once in the master process and fork workers from it, so the
+# imported libraries (including ReportLab and qrcode) are shared copy-on-write
+preload_app = True
+os.environ.setdefault('PRELOAD_RENDERERS', '1')
+
+# Threaded workers keep serving pages while the few allowed change streams are open
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+
+def post_fork(server, worker):
+    # Database connections must not be shared with the master process
+    from app import app, db
+
+    with app.app_context():
+        db.engine.dispose(close=False)